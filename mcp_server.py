@@ -3,14 +3,37 @@ Word MCP SSE Server entry point.
 """
 
 import argparse
+import atexit
 import logging
-from typing import cast
+import logging.handlers
+import threading
+import time
 
 import uvicorn
 
 from src.config import load_config
 from src.mcp_tools import MCPServer, register_tools
 
+# File log records are buffered and written in batches
+LOG_BUFFER_CAPACITY = 1024
+LOG_FLUSH_INTERVAL = 30  # seconds
+LOG_MAX_BYTES = 10_000_000
+LOG_BACKUP_COUNT = 10
+
+# Entry-point logger plus the parent of every module logger in the package
+LOGGER_NAMES = ("word-mcp-server", "src")
+
+
+def start_periodic_flush(handler: logging.Handler, interval: float) -> None:
+    """Flush a buffering handler every interval seconds from a daemon thread."""
+
+    def flush_loop() -> None:
+        while True:
+            time.sleep(interval)
+            handler.flush()
+
+    threading.Thread(target=flush_loop, name="log-flush", daemon=True).start()
+
 
 def setup_logging(
     log_level: str = "INFO", file_logging: bool = False, logs_dir: str = "logs"
@@ -23,26 +46,47 @@ def setup_logging(
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
-    logger = logging.getLogger("word-mcp-server")
-    logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
-
-    # Clear any existing handlers
-    logger.handlers = []
+    handlers: list[logging.Handler] = []
 
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # File handler if enabled
+    log_file_path = None
     if file_logging:
         logs_path = Path(logs_dir)
         logs_path.mkdir(exist_ok=True)
         log_file_path = logs_path / "word-mcp-server.log"
-        file_handler = logging.FileHandler(log_file_path)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+        )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-        logger.info(f"File logging enabled: {log_file_path}")
+
+        # Buffer records so routine INFO logs don't hit the disk one by one;
+        # errors flush immediately, the rest on a timer and at exit
+        buffered_handler = logging.handlers.MemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        )
+        handlers.append(buffered_handler)
+        atexit.register(buffered_handler.flush)
+        start_periodic_flush(buffered_handler, LOG_FLUSH_INTERVAL)
+
+    # Module loggers live under "src" (logging.getLogger(__name__)), so they
+    # need the same handlers as the entry-point logger
+    for name in LOGGER_NAMES:
+        named_logger = logging.getLogger(name)
+        named_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+        named_logger.handlers = list(handlers)
+        named_logger.propagate = False
+
+    logger = logging.getLogger("word-mcp-server")
+    if log_file_path is not None:
+        logger.info("File logging enabled: %s", log_file_path)
 
     logger.info("Logging configured")
     return logger
@@ -69,29 +113,37 @@ def main():
             logger.warning("DEBUG logging enabled - ensure no secrets are logged")
 
         if args.log_level:
-            logger.info(f"Log level overridden to {args.log_level.upper()}")
+            logger.info("Log level overridden to %s", args.log_level.upper())
 
         # Initialize MCP server
         logger.info("Initializing Word MCP server")
-        mcp_server = MCPServer(api_key=cast(str, config.MCP_SERVER_AUTH_KEY))
+        mcp_server = MCPServer(api_key=config.MCP_SERVER_AUTH_KEY)
 
         # Register tools
         logger.info("Registering Word MCP tools")
         register_tools(mcp_server=mcp_server)
 
         # Create and run app
-        logger.info(f"Starting Word MCP server on http://{args.host}:{args.port}")
+        logger.info("Starting Word MCP server on http://%s:%s", args.host, args.port)
         app = mcp_server.create_app(debug=True)
 
         # Start server
         logger.info("Starting Uvicorn server")
-        uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+        uvicorn.run(
+            app,
+            host=args.host,
+            port=args.port,
+            log_level="warning",
+            loop="uvloop",
+            http="httptools",
+            access_log=False,  # requests are already logged by APIKeyMiddleware
+        )
 
     except Exception as e:
         if "logger" in locals():
-            logger.critical(f"Failed to start application: {str(e)}", exc_info=True)
+            logger.critical("Failed to start application: %s", e, exc_info=True)
         else:
-            logging.critical(f"Failed to start application: {str(e)}", exc_info=True)
+            logging.critical("Failed to start application: %s", e, exc_info=True)
         raise
 
 
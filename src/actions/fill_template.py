@@ -2,20 +2,58 @@
 Fill a Word template with context values and save to SharePoint.
 """
 
+import asyncio
+import functools
 import logging
+from io import BytesIO
 
 from ..utils import (
     GraphClient,
+    ProjectState,
     deserialize_context,
-    get_latest_version_filename,
-    next_version_filename,
-    render_template,
+    get_graph_client,
+    load_project_state,
+    render_template_async,
     serialize_context,
 )
 
 logger = logging.getLogger(__name__)
 
 
+async def _load_previous_context(
+    graph: GraphClient,
+    drive_id: str,
+    base_folder: str,
+    project_name: str,
+) -> tuple[ProjectState, dict]:
+    """
+    Find the project's latest version and load its Memory JSON.
+
+    Returns:
+        Tuple of (project state, previous context dict — empty for a new
+        project)
+    """
+    state = await load_project_state(
+        graph=graph,
+        drive_id=drive_id,
+        base_folder=base_folder,
+        project_name=project_name,
+        fresh=True,
+    )
+
+    if not state.latest_docx:
+        logger.info("No previous version found — starting from template")
+        return state, {}
+
+    json_str = await graph.download_sharepoint_json(
+        drive_id=drive_id,
+        folder_path=state.memory_folder,
+        file_name=state.latest_memory,
+    )
+    logger.info("Loaded previous context from %s", state.latest_memory)
+    return state, deserialize_context(json_str)
+
+
 async def fill_template_action(
     template_name: str,
     project_name: str,
@@ -34,8 +72,9 @@ async def fill_template_action(
       SharePoint Memory, merges the new replacements on top, and re-renders
       from the original template with the full merged context.
     - If the project is new, renders directly from the template.
-    - Always saves as the next incremented version with a matching
-      Memory JSON file.
+    - Saves as the next incremented version with a matching Memory JSON
+      file. If the project exists and the replacements change nothing,
+      no new version is created.
 
     Args:
         template_name: The template filename e.g. tender_template.docx
@@ -46,80 +85,95 @@ async def fill_template_action(
     Returns:
         Success message with the new version filename and SharePoint link.
     """
-    logger.info(f"Filling template for project: {project_name}")
+    logger.info("Filling template for project: %s", project_name)
 
-    graph = GraphClient(
+    graph = await get_graph_client(
         tenant_id=azure_tenant_id,
         client_id=azure_client_id,
         client_secret=azure_client_secret,
     )
 
-    # ── Get existing project files ─────────────────────────────────────────────
-    project_folder = f"{sharepoint_output_folder}/{project_name}"
-    memory_folder = f"{project_folder}/Memory"
-
-    existing_items = await graph.list_sharepoint_folder(   # ← changed
-        drive_id=sharepoint_drive_id,                      # ← changed
-        folder_path=project_folder,
+    template_buffer = BytesIO()
+    download_template = functools.partial(
+        graph.download_sharepoint_file,
+        drive_id=sharepoint_drive_id,
+        folder_path=sharepoint_template_folder,
+        file_name=template_name,
+        writer=template_buffer,
+    )
+    load_previous = _load_previous_context(
+        graph=graph,
+        drive_id=sharepoint_drive_id,
+        base_folder=sharepoint_output_folder,
+        project_name=project_name,
     )
-    existing_files = [
-        item["name"] for item in existing_items
-        if not item["is_folder"]
-    ]
-
-    # ── Load previous context if exists ───────────────────────────────────────
-    latest_docx = get_latest_version_filename(project_name, existing_files)
 
-    if latest_docx:
-        # Load previous Memory JSON
-        memory_filename = latest_docx.replace(".docx", ".json")
-        json_str = await graph.download_sharepoint_json(   # ← changed
-            drive_id=sharepoint_drive_id,                  # ← changed
-            folder_path=memory_folder,
-            file_name=memory_filename,
+    # ── Download template while loading the previous context ──────────────────
+    # With no replacements the template is only needed for a new project,
+    # so hold the download until we know whether one exists
+    if replacements:
+        _, (state, previous_context) = await asyncio.gather(
+            download_template(), load_previous
         )
-        previous_context = deserialize_context(json_str)
-        base_label = f"previous version ({latest_docx})"
-        logger.info(f"Loaded previous context from {memory_filename}")
     else:
-        previous_context = {}
-        base_label = f"template ({template_name})"
-        logger.info("No previous version found — starting from template")
+        state, previous_context = await load_previous
+    latest_docx = state.latest_docx
+    new_filename = state.next_filename
 
     # ── Merge contexts ─────────────────────────────────────────────────────────
     merged_context = {**previous_context, **replacements}
 
-    # ── Download template from SharePoint ─────────────────────────────────────
-    template_bytes = await graph.download_sharepoint_file(
-        drive_id=sharepoint_drive_id,
-        folder_path=sharepoint_template_folder,
-        file_name=template_name,
-    )
+    # ── Skip no-op fills ───────────────────────────────────────────────────────
+    if latest_docx and not replacements:
+        return (
+            f"ℹ️ No new replacements provided; latest version is {latest_docx}. "
+            "Use edit_document to change text or provide replacements to re-render."
+        )
 
-    # ── Render template ────────────────────────────────────────────────────────
-    rendered_bytes = render_template(template_bytes, merged_context)
+    if latest_docx and merged_context == previous_context:
+        return (
+            f"ℹ️ The provided values already match {latest_docx}; "
+            "no new version was created."
+        )
+
+    if latest_docx:
+        base_label = f"previous version ({latest_docx})"
+    else:
+        base_label = f"template ({template_name})"
 
-    # ── Calculate next version filename ───────────────────────────────────────
-    new_filename = next_version_filename(project_name, existing_files)
+    if not replacements:
+        # New project filled with template defaults — fetch the deferred template
+        await download_template()
 
-    # ── Upload rendered .docx to SharePoint ───────────────────────────────────
-    web_url = await graph.upload_sharepoint_file(          # ← changed
-        drive_id=sharepoint_drive_id,                      # ← changed
-        folder_path=project_folder,
+    # ── Render template ────────────────────────────────────────────────────────
+    rendered_bytes = await render_template_async(template_buffer, merged_context)
+
+    # ── Upload rendered .docx and Memory JSON to SharePoint ───────────────────
+    memory_filename = new_filename.replace(".docx", ".json")
+    upload_docx = graph.upload_sharepoint_file(
+        drive_id=sharepoint_drive_id,
+        folder_path=state.project_folder,
         file_name=new_filename,
         content=rendered_bytes,
     )
-
-    # ── Upload Memory JSON to SharePoint ──────────────────────────────────────
-    memory_filename = new_filename.replace(".docx", ".json")
-    await graph.upload_sharepoint_json(                    # ← changed
-        drive_id=sharepoint_drive_id,                      # ← changed
-        folder_path=memory_folder,
+    upload_memory = graph.upload_sharepoint_json(
+        drive_id=sharepoint_drive_id,
+        folder_path=state.memory_folder,
         file_name=memory_filename,
         content=serialize_context(merged_context),
     )
 
-    logger.info(f"Successfully created {new_filename} for project {project_name}")
+    if latest_docx:
+        web_url, _ = await asyncio.gather(upload_docx, upload_memory)
+    else:
+        # New project: the first upload creates the project folder, so run the
+        # uploads in order rather than racing two implicit folder creations
+        web_url = await upload_docx
+        await upload_memory
+
+    logger.info(
+        "Successfully created %s for project %s", new_filename, project_name
+    )
 
     return (
         f"✅ Document saved successfully!\n"
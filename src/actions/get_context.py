@@ -5,10 +5,9 @@ Retrieve the saved context for the latest version of a document project.
 import logging
 
 from ..utils import (
-    GraphClient,
     deserialize_context,
-    get_latest_version_filename,
-    get_version_number,
+    get_graph_client,
+    load_project_state,
 )
 
 logger = logging.getLogger(__name__)
@@ -35,43 +34,31 @@ async def get_context_action(
         All currently filled placeholder values for the latest version,
         or a message if no context exists yet.
     """
-    logger.info(f"Getting context for project: {project_name}")
+    logger.info("Getting context for project: %s", project_name)
 
-    graph = GraphClient(
+    graph = await get_graph_client(
         tenant_id=azure_tenant_id,
         client_id=azure_client_id,
         client_secret=azure_client_secret,
     )
 
-    # ── Get existing project files ─────────────────────────────────────────────
-    project_folder = f"{sharepoint_output_folder}/{project_name}"
-    memory_folder = f"{project_folder}/Memory"
-
-    existing_items = await graph.list_sharepoint_folder(   # ← changed
-        drive_id=sharepoint_drive_id,                      # ← changed
-        folder_path=project_folder,
-    )
-
-    if not existing_items:
-        return f"No versions found for project '{project_name}'."
-
-    existing_files = [
-        item["name"] for item in existing_items
-        if not item["is_folder"]
-    ]
-
     # ── Find latest version ────────────────────────────────────────────────────
-    latest_docx = get_latest_version_filename(project_name, existing_files)
+    state = await load_project_state(
+        graph=graph,
+        drive_id=sharepoint_drive_id,
+        base_folder=sharepoint_output_folder,
+        project_name=project_name,
+    )
+    latest_docx = state.latest_docx
 
     if not latest_docx:
         return f"No versions found for project '{project_name}'."
 
     # ── Load Memory JSON ───────────────────────────────────────────────────────
-    memory_filename = latest_docx.replace(".docx", ".json")
-    json_str = await graph.download_sharepoint_json(       # ← changed
-        drive_id=sharepoint_drive_id,                      # ← changed
-        folder_path=memory_folder,
-        file_name=memory_filename,
+    json_str = await graph.download_sharepoint_json(
+        drive_id=sharepoint_drive_id,
+        folder_path=state.memory_folder,
+        file_name=state.latest_memory,
     )
 
     context = deserialize_context(json_str)
@@ -83,12 +70,11 @@ async def get_context_action(
         )
 
     # ── Format output ──────────────────────────────────────────────────────────
-    version = get_version_number(latest_docx)
-    result = (
+    lines = [
         f"Current values for project '{project_name}' "
-        f"(v{str(version).zfill(2)}):\n\n"
-    )
+        f"(v{str(state.latest_version).zfill(2)}):\n"
+    ]
     for key, value in sorted(context.items()):
-        result += f"  - {key}: {value}\n"
+        lines.append(f"  - {key}: {value}")
 
-    return result
\ No newline at end of file
+    return "\n".join(lines) + "\n"
\ No newline at end of file
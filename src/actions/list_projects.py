@@ -4,7 +4,7 @@ List existing document projects from SharePoint output folder.
 
 import logging
 
-from ..utils import GraphClient, get_version_number
+from ..utils import file_names, folder_names, get_graph_client, scan_versions
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +29,7 @@ async def list_projects_action(
     """
     logger.info("Listing document projects from SharePoint")
 
-    graph = GraphClient(
+    graph = await get_graph_client(
         tenant_id=azure_tenant_id,
         client_id=azure_client_id,
         client_secret=azure_client_secret,
@@ -48,7 +48,7 @@ async def list_projects_action(
         )
 
     # Each subfolder is a project
-    projects = [item["name"] for item in items if item["is_folder"]]
+    projects = sorted(folder_names(items))
 
     if not projects:
         return (
@@ -56,24 +56,28 @@ async def list_projects_action(
             "All documents will start fresh from a template."
         )
 
-    # For each project find the latest version
-    result = "Existing document projects:\n"
-    for project in sorted(projects):
-        project_items = await graph.list_sharepoint_folder(    # ← changed
-            drive_id=sharepoint_drive_id,                      # ← changed
-            folder_path=f"{sharepoint_output_folder}/{project}",
-        )
-        docx_files = [
-            item["name"] for item in project_items
-            if not item["is_folder"] and item["name"].endswith(".docx")
-        ]
-
-        if docx_files:
-            latest = max(docx_files, key=get_version_number)
-            version = get_version_number(latest)
-            result += f"  - {project} (latest: v{str(version).zfill(2)})\n"
+    # For each project find the latest version — all project folders are
+    # listed through Graph JSON batching rather than one request each
+    per_project_items = await graph.batch_list_folders(
+        drive_id=sharepoint_drive_id,
+        folder_paths=[f"{sharepoint_output_folder}/{p}" for p in projects],
+    )
+
+    lines = ["Existing document projects:"]
+    for project, project_items in zip(projects, per_project_items):
+        if project_items is None:
+            lines.append(f"  - {project} (could not be read)")
+            continue
+
+        latest, _, version = scan_versions(project, file_names(project_items))
+
+        if latest:
+            lines.append(f"  - {project} (latest: v{str(version).zfill(2)})")
         else:
-            result += f"  - {project} (no versions yet)\n"
+            lines.append(f"  - {project} (no versions yet)")
 
-    result += "\nTo continue editing a project, provide its name. To start a new project, provide a new name."
-    return result
\ No newline at end of file
+    lines.append(
+        "\nTo continue editing a project, provide its name. "
+        "To start a new project, provide a new name."
+    )
+    return "\n".join(lines)
\ No newline at end of file
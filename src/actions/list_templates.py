@@ -4,7 +4,7 @@ List available Word templates from SharePoint.
 
 import logging
 
-from ..utils import GraphClient
+from ..utils import get_graph_client
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +26,7 @@ async def list_templates_action(
     """
     logger.info("Listing SharePoint templates")
 
-    graph = GraphClient(
+    graph = await get_graph_client(
         tenant_id=azure_tenant_id,
         client_id=azure_client_id,
         client_secret=azure_client_secret,
@@ -3,8 +3,9 @@ Read and list all placeholders from a Word template stored in SharePoint.
 """
 
 import logging
+from io import BytesIO
 
-from ..utils import GraphClient, scan_placeholders
+from ..utils import get_graph_client, scan_placeholders_async
 
 logger = logging.getLogger(__name__)
 
@@ -29,23 +30,25 @@ async def read_template_placeholders_action(
     Returns:
         A list of all placeholder names found in the template.
     """
-    logger.info(f"Reading placeholders from template: {template_name}")
+    logger.info("Reading placeholders from template: %s", template_name)
 
-    graph = GraphClient(
+    graph = await get_graph_client(
         tenant_id=azure_tenant_id,
         client_id=azure_client_id,
         client_secret=azure_client_secret,
     )
 
-    # Download template from SharePoint
-    template_bytes = await graph.download_sharepoint_file(
-        drive_id=sharepoint_drive_id,              # ← changed
+    # Stream template from SharePoint
+    template_buffer = BytesIO()
+    await graph.download_sharepoint_file(
+        drive_id=sharepoint_drive_id,
         folder_path=sharepoint_template_folder,
         file_name=template_name,
+        writer=template_buffer,
     )
 
     # Scan for placeholders
-    placeholders = scan_placeholders(template_bytes)
+    placeholders = await scan_placeholders_async(template_buffer)
 
     if not placeholders:
         return f"No placeholders found in '{template_name}'."
@@ -2,6 +2,8 @@
 Configuration for the Word MCP SSE Server.
 """
 
+import functools
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
@@ -38,15 +40,49 @@ class Settings(BaseSettings):
     )
 
 
-def load_config(dotenv_path: Optional[Path] = None) -> Settings:
+# Keys that must be set for the server to start
+REQUIRED_KEYS = (
+    "MCP_SERVER_AUTH_KEY",
+    "AZURE_TENANT_ID",
+    "AZURE_CLIENT_ID",
+    "AZURE_CLIENT_SECRET",
+    "SHAREPOINT_DRIVE_ID",
+    "SHAREPOINT_TEMPLATE_FOLDER",
+    "SHAREPOINT_OUTPUT_FOLDER",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ValidatedConfig:
+    """Settings after validation — every required key is a non-empty str."""
+
+    MCP_SERVER_AUTH_KEY: str = field(repr=False)
+    AZURE_TENANT_ID: str
+    AZURE_CLIENT_ID: str
+    AZURE_CLIENT_SECRET: str = field(repr=False)
+    SHAREPOINT_DRIVE_ID: str
+    SHAREPOINT_TEMPLATE_FOLDER: str
+    SHAREPOINT_OUTPUT_FOLDER: str
+
+    LOG_LEVEL: str
+    ENVIRONMENT: str
+    FILE_LOGGING: bool
+    LOGS_DIR: str
+
+
+@functools.lru_cache(maxsize=1)
+def load_config(dotenv_path: Optional[Path] = None) -> ValidatedConfig:
     """
     Load configuration from environment variables and .env file.
 
+    The result is cached for the life of the process; call
+    load_config.cache_clear() to reload.
+
     Args:
         dotenv_path: Path to .env file. Defaults to .env in project root.
 
     Returns:
-        Settings object with loaded configuration.
+        ValidatedConfig with the loaded configuration.
 
     Raises:
         ValueError: If required configuration is missing.
@@ -61,18 +97,9 @@ def load_config(dotenv_path: Optional[Path] = None) -> Settings:
     settings = Settings()
 
     # Validate required keys
-    required_keys = [
-        "MCP_SERVER_AUTH_KEY",
-        "AZURE_TENANT_ID",
-        "AZURE_CLIENT_ID",
-        "AZURE_CLIENT_SECRET",
-        "SHAREPOINT_DRIVE_ID",
-        "SHAREPOINT_TEMPLATE_FOLDER",
-        "SHAREPOINT_OUTPUT_FOLDER",        # ← added
-    ]
     missing_keys = []
 
-    for key in required_keys:
+    for key in REQUIRED_KEYS:
         value = getattr(settings, key)
         if value is None or value == "":
             missing_keys.append(key)
@@ -80,4 +107,10 @@ def load_config(dotenv_path: Optional[Path] = None) -> Settings:
     if missing_keys:
         raise ValueError(f"Missing required configuration: {', '.join(missing_keys)}")
 
-    return settings
\ No newline at end of file
+    return ValidatedConfig(
+        **{key: getattr(settings, key) for key in REQUIRED_KEYS},
+        LOG_LEVEL=settings.LOG_LEVEL,
+        ENVIRONMENT=settings.ENVIRONMENT,
+        FILE_LOGGING=settings.FILE_LOGGING,
+        LOGS_DIR=settings.LOGS_DIR,
+    )
\ No newline at end of file
@@ -2,12 +2,17 @@
 MCP tools registration for the Word MCP SSE Server.
 """
 
+import functools
+import hmac
 import importlib
 import inspect
+import itertools
 import logging
 import pkgutil
-import uuid
-from typing import Callable, TypeVar
+import sys
+from contextlib import asynccontextmanager
+from types import ModuleType
+from typing import AsyncIterator, Callable, TypeVar
 
 from mcp.server.fastmcp import FastMCP
 from mcp.server.sse import SseServerTransport
@@ -19,6 +24,7 @@ from starlette.responses import JSONResponse
 from starlette.routing import Mount, Route
 
 from . import actions
+from .utils import close_graph_clients
 
 # ------------------------------------------------------------
 # Central place where *all* server-supplied objects live
@@ -30,6 +36,14 @@ DEPENDENCIES: dict[str, object] = {
 T = TypeVar("T")
 logger = logging.getLogger(__name__)
 
+# Request IDs only tag log lines, so a process-wide counter is enough
+_request_counter = itertools.count(1)
+
+
+def _next_request_id() -> str:
+    """Return the next request ID as a short hex string."""
+    return format(next(_request_counter), "x")
+
 
 class APIKeyMiddleware(BaseHTTPMiddleware):
     """Middleware for API key authentication."""
@@ -37,24 +51,28 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, api_key: str):
         super().__init__(app)
         self.api_key = api_key
+        self._api_key_bytes = api_key.encode("utf-8")
 
     async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
+        request_id = _next_request_id()
 
-        logger.info(f"[{request_id}] {request.method} {request.url.path}")
+        logger.info("[%s] %s %s", request_id, request.method, request.url.path)
 
         # Skip auth for health endpoint
         if request.url.path == "/health":
             return await call_next(request)
 
-        # Check API key
-        if request.headers.get("X-API-Key") == self.api_key:
-            logger.debug(f"[{request_id}] API key authentication successful")
+        # Check API key in constant time
+        provided = request.headers.get("X-API-Key", "").encode("utf-8")
+        if hmac.compare_digest(provided, self._api_key_bytes):
+            logger.debug("[%s] API key authentication successful", request_id)
             response = await call_next(request)
-            logger.info(f"[{request_id}] Completed with status {response.status_code}")
+            logger.info(
+                "[%s] Completed with status %s", request_id, response.status_code
+            )
             return response
         else:
-            logger.warning(f"[{request_id}] Unauthorized: Invalid API key")
+            logger.warning("[%s] Unauthorized: Invalid API key", request_id)
             return JSONResponse({"error": "Unauthorized"}, status_code=401)
 
 
@@ -64,11 +82,11 @@ class MCPServer:
     def __init__(self, api_key: str, service_name: str = "word-mcp-server"):
         self.api_key = api_key
         self.mcp = FastMCP(service_name)
-        logger.info(f"Initialized MCP server: {service_name}")
+        logger.info("Initialized MCP server: %s", service_name)
 
     def register_tool(self, func: Callable[..., T]) -> Callable[..., T]:
         """Register a function as an MCP tool."""
-        logger.info(f"Registering MCP tool: {func.__name__}")
+        logger.info("Registering MCP tool: %s", func.__name__)
         return self.mcp.tool()(func)
 
     def create_app(self, debug: bool = False) -> Starlette:
@@ -76,12 +94,14 @@ class MCPServer:
         sse = SseServerTransport("/messages/")
 
         async def handle_sse(request: Request) -> JSONResponse | None:
-            request_id = str(uuid.uuid4())
-            logger.info(f"[{request_id}] SSE connection established")
+            request_id = _next_request_id()
+            logger.info("[%s] SSE connection established", request_id)
 
             if request.method in {"HEAD", "OPTIONS"}:
                 logger.debug(
-                    f"[{request_id}] Non-streaming method {request.method} received – returning 200"
+                    "[%s] Non-streaming method %s received – returning 200",
+                    request_id,
+                    request.method,
                 )
                 return JSONResponse({"status": "ok"}, status_code=200)
 
@@ -95,10 +115,10 @@ class MCPServer:
                         self.mcp._mcp_server.create_initialization_options(),
                     )
             except Exception as e:
-                logger.error(f"[{request_id}] SSE error: {str(e)}", exc_info=True)
+                logger.error("[%s] SSE error: %s", request_id, e, exc_info=True)
                 raise
             finally:
-                logger.info(f"[{request_id}] SSE connection closed")
+                logger.info("[%s] SSE connection closed", request_id)
 
         async def handle_health(request: Request) -> JSONResponse:
             """Health check endpoint."""
@@ -108,6 +128,12 @@ class MCPServer:
                 "version": "1.0.0"
             }, status_code=200)
 
+        @asynccontextmanager
+        async def lifespan(app: Starlette) -> AsyncIterator[None]:
+            """Release shared Graph connections when the server shuts down."""
+            yield
+            await close_graph_clients()
+
         # Health endpoint bypasses API key middleware
         health_routes = [Route("/health", endpoint=handle_health)]
 
@@ -122,6 +148,7 @@ class MCPServer:
             debug=debug,
             routes=health_routes + protected_routes,
             middleware=protected_middleware,
+            lifespan=lifespan,
         )
 
         logger.info("Starlette application created")
@@ -137,12 +164,11 @@ def make_wrapper(action_func):
         if name in sig.parameters
     }
 
+    @functools.wraps(action_func)
     async def wrapper(**kwargs):
-        kwargs.update(wanted)
-        return await action_func(**kwargs)
+        return await action_func(**kwargs, **wanted)
 
     wrapper.__name__ = action_func.__name__.replace("_action", "_tool")
-    wrapper.__doc__ = action_func.__doc__
 
     # Build a new signature that excludes injected parameters
     params = [
@@ -154,16 +180,37 @@ def make_wrapper(action_func):
         return_annotation=sig.return_annotation,
     )
 
-    # Copy annotations but remove injected parameters
-    if hasattr(action_func, "__annotations__"):
-        wrapper.__annotations__ = {
-            k: v for k, v in action_func.__annotations__.items()
-            if k not in wanted
-        }
+    # Drop injected parameters from the annotations copied by functools.wraps
+    wrapper.__annotations__ = {
+        k: v for k, v in action_func.__annotations__.items()
+        if k not in wanted
+    }
 
     return wrapper
 
 
+def _cached_import(name: str) -> ModuleType:
+    """Import a module by absolute name, reusing it if already loaded."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return importlib.import_module(name)
+
+
+def _module_actions(mod: ModuleType) -> list[tuple[str, Callable]]:
+    """
+    Return a module's *_action coroutine functions, sorted by name.
+
+    Filters on the name before touching the value, rather than having
+    inspect.getmembers fetch and test every attribute of the module.
+    """
+    return sorted(
+        (name, value)
+        for name, value in vars(mod).items()
+        if name.endswith("_action") and inspect.iscoroutinefunction(value)
+    )
+
+
 def register_tools(mcp_server: MCPServer) -> None:
     """Register all MCP tools by auto-discovering action modules."""
 
@@ -185,20 +232,17 @@ def register_tools(mcp_server: MCPServer) -> None:
     # Auto-discover and register all action functions
     for _, module_name, _ in pkgutil.iter_modules(actions.__path__):
         try:
-            mod = importlib.import_module(
-                f".actions.{module_name}", package=__package__
-            )
-            logger.debug(f"Loaded action module: {module_name}")
+            mod = _cached_import(f"{actions.__name__}.{module_name}")
+            logger.debug("Loaded action module: %s", module_name)
 
-            for name, func in inspect.getmembers(mod, inspect.iscoroutinefunction):
-                if name.endswith("_action"):
-                    logger.info(f"Registering action: {name}")
-                    tool_wrapper = make_wrapper(func)
-                    mcp_server.register_tool(tool_wrapper)
+            for name, func in _module_actions(mod):
+                logger.info("Registering action: %s", name)
+                tool_wrapper = make_wrapper(func)
+                mcp_server.register_tool(tool_wrapper)
 
         except Exception as e:
             logger.error(
-                f"Failed to load action module {module_name}: {str(e)}", exc_info=True
+                "Failed to load action module %s: %s", module_name, e, exc_info=True
             )
             raise
 
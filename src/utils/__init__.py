@@ -3,10 +3,16 @@ Utility modules for the Word MCP SSE Server.
 """
 
 from .graph_client import GraphClient
+from .graph_client_cache import close_graph_clients, get_graph_client
 from .docx_utils import (
     scan_placeholders,
+    scan_and_prepare,
+    render_prepared,
     render_template,
     find_and_replace,
+    scan_placeholders_async,
+    render_template_async,
+    find_and_replace_async,
     get_version_number,
     get_family_name,
     next_version_filename,
@@ -14,16 +20,35 @@ from .docx_utils import (
     serialize_context,
     deserialize_context,
 )
+from .versions import scan_versions
+from .project_state import (
+    ProjectState,
+    file_names,
+    folder_names,
+    load_project_state,
+)
 
 __all__ = [
     "GraphClient",
+    "get_graph_client",
+    "close_graph_clients",
     "scan_placeholders",
+    "scan_and_prepare",
+    "render_prepared",
     "render_template",
     "find_and_replace",
+    "scan_placeholders_async",
+    "render_template_async",
+    "find_and_replace_async",
     "get_version_number",
     "get_family_name",
     "next_version_filename",
     "get_latest_version_filename",
     "serialize_context",
     "deserialize_context",
+    "scan_versions",
+    "ProjectState",
+    "load_project_state",
+    "file_names",
+    "folder_names",
 ]
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+In-flight request coalescing for Microsoft Graph reads.
+Concurrent identical reads share one downstream request instead of each
+issuing their own.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+# key → task running the shared request
+_inflight: dict[Hashable, asyncio.Future] = {}
+
+
+async def coalesce(key: Hashable, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run coro_factory() once for every concurrent caller passing the same key.
+
+    The first caller starts the request; callers arriving before it finishes
+    await the same result (or exception). The key is released as soon as the
+    request completes, so later calls always fetch fresh data. Results are
+    shared, callers must not mutate them.
+    """
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(coro_factory())
+        _inflight[key] = future
+
+        def release(done: asyncio.Future) -> None:
+            if _inflight.get(key) is done:
+                del _inflight[key]
+            # Mark the error retrieved in case every waiter was cancelled
+            if not done.cancelled():
+                done.exception()
+
+        future.add_done_callback(release)
+
+    # Shielded so one caller being cancelled does not cancel the others
+    return await asyncio.shield(future)
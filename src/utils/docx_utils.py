@@ -3,121 +3,227 @@ Word document utilities for Word MCP Server.
 Handles template rendering, placeholder scanning and find & replace.
 """
 
-import json
+import functools
 import logging
-import re
+import os
 from io import BytesIO
+from typing import BinaryIO, Iterator
 
+import anyio.to_thread
+import orjson
 from docx import Document
+from docx.oxml import parse_xml
+from docx.text.paragraph import Paragraph
 from docxtpl import DocxTemplate
+from jinja2 import Environment, meta
+
+from .versions import parse_version, scan_versions
 
 logger = logging.getLogger(__name__)
 
+# Indented, sorted Memory JSON; non-str keys (e.g. ints) are stringified as
+# the stdlib json module did
+_CONTEXT_JSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+)
+
+# .docx parsing and saving is CPU-bound; the async variants below run it in
+# worker threads, at most one per CPU, so the event loop keeps serving
+# other SSE streams
+_DOCX_LIMITER = anyio.CapacityLimiter(os.cpu_count() or 1)
+
+# Number of compiled document parts kept for re-rendering
+TEMPLATE_CACHE_SIZE = 32
+
+
+class _CachingEnvironment(Environment):
+    """Jinja environment that reuses compiled templates for identical sources."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._template_cache = functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(
+            super().from_string
+        )
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None:
+            return super().from_string(source, globals, template_class)
+        return self._template_cache(source)
+
 
-def scan_placeholders(template_bytes: bytes) -> list[str]:
+# Shared by every render so re-rendering a template skips the Jinja compile
+_JINJA_ENV = _CachingEnvironment(autoescape=False)
+
+
+def _as_stream(source: bytes | BinaryIO) -> BinaryIO:
+    """Wrap raw bytes in a stream, or rewind an existing stream for reading."""
+    if isinstance(source, (bytes, bytearray)):
+        return BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _iter_all_paragraphs(doc) -> Iterator[Paragraph]:
+    """Yield the body paragraphs of a document, then those in its table cells."""
+    yield from doc.paragraphs
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                yield from cell.paragraphs
+
+
+def scan_placeholders(template_bytes: bytes | BinaryIO) -> list[str]:
     """
-    Scan a .docx template for Jinja2 {{ placeholder }} tags.
+    Scan a .docx template for the Jinja2 variables it references.
+
+    Reads the template's Jinja AST (see scan_and_prepare), so {{ placeholder }}
+    tags split across runs, filtered values and loop sources are all found.
 
     Args:
-        template_bytes: Raw bytes of the .docx file
+        template_bytes: Raw bytes of the .docx file, or a stream holding them
 
     Returns:
         Sorted list of placeholder names found
     """
-    doc = Document(BytesIO(template_bytes))
-    placeholders = set()
-    pattern = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+    placeholders, _ = scan_and_prepare(template_bytes)
 
-    # Scan paragraphs
-    for para in doc.paragraphs:
-        matches = pattern.findall(para.text)
-        placeholders.update(matches)
+    logger.info("Found %s placeholders in template", len(placeholders))
+    return placeholders
 
-    # Scan tables
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for para in cell.paragraphs:
-                    matches = pattern.findall(para.text)
-                    placeholders.update(matches)
 
-    logger.info(f"Found {len(placeholders)} placeholders in template")
-    return sorted(placeholders)
+def scan_and_prepare(
+    template_bytes: bytes | BinaryIO,
+) -> tuple[list[str], DocxTemplate]:
+    """
+    Open a .docx template once and list the variables it references.
+
+    Variables come from the Jinja AST of the body, headers and footers, so
+    filters, attributes and {% for %} blocks are understood. The returned
+    template is already parsed and can be passed to render_prepared.
 
+    Args:
+        template_bytes: Raw bytes of the .docx template, or a stream holding them
 
-def render_template(template_bytes: bytes, context: dict) -> bytes:
+    Returns:
+        Tuple of (sorted variable names, loaded DocxTemplate)
     """
-    Render a .docx template by filling in Jinja2 placeholders.
+    tpl = DocxTemplate(_as_stream(template_bytes))
+    tpl.init_docx()
+
+    xml = tpl.patch_xml(tpl.get_xml())
+    for rel in tpl.docx.part.rels.values():
+        if rel.reltype in (tpl.HEADER_URI, tpl.FOOTER_URI) and rel.target_part.blob:
+            xml += tpl.patch_xml(tpl.xml_to_string(parse_xml(rel.target_part.blob)))
+
+    variables = meta.find_undeclared_variables(_JINJA_ENV.parse(xml))
+    return sorted(variables), tpl
+
+
+def render_prepared(tpl: DocxTemplate, context: dict) -> bytes:
+    """
+    Render a template loaded by scan_and_prepare without parsing it again.
 
     Args:
-        template_bytes: Raw bytes of the .docx template
+        tpl: Template returned by scan_and_prepare
         context: Dict of placeholder keys and their values
 
     Returns:
         Rendered .docx file as bytes
     """
-    doc = DocxTemplate(BytesIO(template_bytes))
-    doc.render(context)
+    tpl.render(context, jinja_env=_JINJA_ENV)
 
     output = BytesIO()
-    doc.save(output)
-    output.seek(0)
+    tpl.save(output)
+
+    logger.info("Template rendered with %s context values", len(context))
+    return output.getvalue()
+
+
+def render_template(template_bytes: bytes | BinaryIO, context: dict) -> bytes:
+    """
+    Render a .docx template by filling in Jinja2 placeholders.
+
+    Args:
+        template_bytes: Raw bytes of the .docx template, or a stream holding them
+        context: Dict of placeholder keys and their values
 
-    logger.info(f"Template rendered with {len(context)} context values")
-    return output.read()
+    Returns:
+        Rendered .docx file as bytes
+    """
+    return render_prepared(DocxTemplate(_as_stream(template_bytes)), context)
 
 
-def find_and_replace(docx_bytes: bytes, find_text: str, replace_text: str) -> tuple[bytes, int]:
+def find_and_replace(
+    docx_bytes: bytes | BinaryIO, find_text: str, replace_text: str
+) -> tuple[bytes, int]:
     """
     Perform a find and replace on a rendered .docx file.
 
     Args:
-        docx_bytes: Raw bytes of the .docx file
+        docx_bytes: Raw bytes of the .docx file, or a stream holding them
         find_text: Text to find
         replace_text: Text to replace it with
 
     Returns:
         Tuple of (updated .docx bytes, number of replacements made)
     """
-    doc = Document(BytesIO(docx_bytes))
+    doc = Document(_as_stream(docx_bytes))
     replacements_made = 0
 
-    # Search paragraphs
-    for para in doc.paragraphs:
-        if find_text in para.text:
-            for run in para.runs:
-                if find_text in run.text:
-                    run.text = run.text.replace(find_text, replace_text)
-                    replacements_made += 1
-
-    # Search tables
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for para in cell.paragraphs:
-                    if find_text in para.text:
-                        for run in para.runs:
-                            if find_text in run.text:
-                                run.text = run.text.replace(find_text, replace_text)
-                                replacements_made += 1
+    # A match spanning several runs is not replaced, so only runs are checked
+    for para in _iter_all_paragraphs(doc):
+        for run in para.runs:
+            if find_text in run.text:
+                run.text = run.text.replace(find_text, replace_text)
+                replacements_made += 1
 
     output = BytesIO()
     doc.save(output)
-    output.seek(0)
 
-    logger.info(f"Find & replace: '{find_text}' → '{replace_text}' ({replacements_made} replacements)")
-    return output.read(), replacements_made
+    logger.info(
+        "Find & replace: '%s' → '%s' (%s replacements)",
+        find_text,
+        replace_text,
+        replacements_made,
+    )
+    return output.getvalue(), replacements_made
+
+
+async def scan_placeholders_async(template_bytes: bytes | BinaryIO) -> list[str]:
+    """Run scan_placeholders in a worker thread."""
+    return await anyio.to_thread.run_sync(
+        scan_placeholders, template_bytes, limiter=_DOCX_LIMITER
+    )
+
+
+async def render_template_async(
+    template_bytes: bytes | BinaryIO, context: dict
+) -> bytes:
+    """Run render_template in a worker thread."""
+    return await anyio.to_thread.run_sync(
+        render_template, template_bytes, context, limiter=_DOCX_LIMITER
+    )
+
+
+async def find_and_replace_async(
+    docx_bytes: bytes | BinaryIO, find_text: str, replace_text: str
+) -> tuple[bytes, int]:
+    """Run find_and_replace in a worker thread."""
+    return await anyio.to_thread.run_sync(
+        find_and_replace, docx_bytes, find_text, replace_text, limiter=_DOCX_LIMITER
+    )
 
 
 def get_version_number(filename: str) -> int:
     """Extract version number from a filename like tender_BSCGlobal_v03.docx"""
-    match = re.search(r'_v(\d+)\.docx$', filename, re.IGNORECASE)
-    return int(match.group(1)) if match else 0
+    parsed = parse_version(filename)
+    return parsed[1] if parsed else 0
 
 
 def get_family_name(filename: str) -> str:
     """Strip version suffix to get family name e.g. tender_BSCGlobal_v03.docx -> tender_BSCGlobal"""
-    return re.sub(r'_v\d+\.docx$', '', filename, flags=re.IGNORECASE)
+    parsed = parse_version(filename)
+    return parsed[0] if parsed else filename
 
 
 def next_version_filename(family_name: str, existing_files: list[str]) -> str:
@@ -131,19 +237,7 @@ def next_version_filename(family_name: str, existing_files: list[str]) -> str:
     Returns:
         Next version filename e.g. tender_BSCGlobal_v03.docx
     """
-    family_files = [
-        f for f in existing_files
-        if get_family_name(f).lower() == family_name.lower()
-        and f.endswith(".docx")
-    ]
-
-    if not family_files:
-        next_num = 1
-    else:
-        latest_version = max(get_version_number(f) for f in family_files)
-        next_num = latest_version + 1
-
-    return f"{family_name}_v{str(next_num).zfill(2)}.docx"
+    return scan_versions(family_name, existing_files)[1]
 
 
 def get_latest_version_filename(family_name: str, existing_files: list[str]) -> str | None:
@@ -157,25 +251,16 @@ def get_latest_version_filename(family_name: str, existing_files: list[str]) ->
     Returns:
         Latest version filename or None if no versions exist
     """
-    family_files = [
-        f for f in existing_files
-        if get_family_name(f).lower() == family_name.lower()
-        and f.endswith(".docx")
-    ]
-
-    if not family_files:
-        return None
-
-    return max(family_files, key=get_version_number)
+    return scan_versions(family_name, existing_files)[0]
 
 
-def serialize_context(context: dict) -> str:
-    """Serialize a context dict to a JSON string for storage."""
-    return json.dumps(context, indent=2, ensure_ascii=False)
+def serialize_context(context: dict) -> bytes:
+    """Serialize a context dict to UTF-8 JSON bytes for storage, keys sorted."""
+    return orjson.dumps(context, option=_CONTEXT_JSON_OPTIONS)
 
 
-def deserialize_context(json_str: str) -> dict:
-    """Deserialize a JSON string back to a context dict."""
+def deserialize_context(json_str: str | bytes) -> dict:
+    """Deserialize JSON text or bytes back to a context dict."""
     if not json_str:
         return {}
-    return json.loads(json_str)
\ No newline at end of file
+    return orjson.loads(json_str)
\ No newline at end of file
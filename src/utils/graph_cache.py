@@ -0,0 +1,105 @@
+"""
+Short-lived cache for Microsoft Graph folder listings.
+Back-to-back tool calls re-list the same SharePoint folders, whose contents
+change on the order of minutes, so listings are reused for a few seconds.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# (method name, drive_id, folder_path) → (expiry time, listing)
+_cache: dict[tuple[str, str, str], tuple[float, list]] = {}
+_locks: dict[tuple[str, str, str], asyncio.Lock] = {}
+
+# Bumped on every invalidation so listings that were in flight while a
+# folder changed are not stored over the fresh state
+_generation = 0
+
+ListMethod = Callable[..., Awaitable[list]]
+
+
+def ttl_cache(ttl: float = 30) -> Callable[[ListMethod], ListMethod]:
+    """
+    Cache a GraphClient listing method per (drive_id, folder_path) for ttl seconds.
+
+    Concurrent misses for the same folder wait on a per-key lock so only
+    one request reaches Graph. Cached lists are shared, callers must not
+    mutate them. Pass fresh=True to always list from Graph, e.g. when the
+    listing decides the name of a file about to be written; the fresh
+    listing still refreshes the cache.
+    """
+
+    def decorator(func: ListMethod) -> ListMethod:
+        @functools.wraps(func)
+        async def wrapper(
+            self, drive_id: str, folder_path: str, fresh: bool = False
+        ) -> list:
+            key = (func.__name__, drive_id, folder_path)
+
+            if fresh:
+                generation = _generation
+                result = await func(self, drive_id, folder_path)
+                if generation == _generation:
+                    _cache[key] = (time.monotonic() + ttl, result)
+                return result
+
+            entry = _cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+            lock = _locks.setdefault(key, asyncio.Lock())
+            try:
+                async with lock:
+                    # Another caller may have filled the entry while we waited
+                    entry = _cache.get(key)
+                    if entry is not None and entry[0] > time.monotonic():
+                        return entry[1]
+
+                    generation = _generation
+                    result = await func(self, drive_id, folder_path)
+                    if generation == _generation:
+                        _cache[key] = (time.monotonic() + ttl, result)
+                    return result
+            finally:
+                # Waiters keep their own reference; later callers hit the cache
+                if _locks.get(key) is lock and not lock.locked():
+                    del _locks[key]
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(drive_id: str, folder_path: str) -> None:
+    """
+    Drop cached listings affected by a write to folder_path.
+
+    The folder itself and all its ancestors are invalidated, since an upload
+    can implicitly create the folder inside its parent.
+    """
+    global _generation
+    _generation += 1
+
+    stale = [
+        key for key in _cache
+        if key[1] == drive_id
+        and (key[2] == folder_path or folder_path.startswith(f"{key[2]}/"))
+    ]
+    for key in stale:
+        del _cache[key]
+
+    if stale:
+        logger.debug(
+            "Invalidated %s cached listing(s) for %s", len(stale), folder_path
+        )
+
+
+def clear() -> None:
+    """Drop every cached listing and its fill lock."""
+    _cache.clear()
+    _locks.clear()
@@ -3,163 +3,571 @@ Microsoft Graph API client for Word MCP Server.
 Handles authentication and all SharePoint/OneDrive operations.
 """
 
+import asyncio
 import logging
+import time
+from io import BytesIO
+from typing import AsyncIterator, BinaryIO
 from urllib.parse import quote
 
 import httpx
-import msal
+import orjson
+
+from . import graph_cache
+from .coalesce import coalesce
 
 logger = logging.getLogger(__name__)
 
+JSON_CONTENT_TYPE = "application/json"
+DOCX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+)
+
 
 class GraphClient:
     """Handles all Microsoft Graph API operations."""
 
     GRAPH_BASE = "https://graph.microsoft.com/v1.0"
+    GRAPH_SCOPE = "https://graph.microsoft.com/.default"
+    TOKEN_URL = "https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+    BATCH_LIMIT = 20  # Maximum requests per Graph JSON batch
+    BATCH_MAX_RETRIES = 3  # Retries for throttled (429) batched requests
+    BATCH_MAX_RETRY_AFTER = 30  # Longest Retry-After delay we will wait, seconds
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    SIMPLE_UPLOAD_LIMIT = 4 * 1024 * 1024  # Largest file Graph accepts in one PUT
+    UPLOAD_FRAGMENT_SIZE = 32 * 320 * 1024  # 10 MiB, must be a multiple of 320 KiB
+    TOKEN_REFRESH_MARGIN = 60  # Seconds before expiry to fetch a new token
+    HTTP_TIMEOUT = 30.0  # Seconds per request phase (connect, read, write, pool)
+    USER_AGENT = "word-mcp"
 
     def __init__(self, tenant_id: str, client_id: str, client_secret: str):
         self.tenant_id = tenant_id
         self.client_id = client_id
         self.client_secret = client_secret
         self._token: str | None = None
+        self._auth_header = ""  # "Bearer <token>", rebuilt only on refresh
+        self._token_expiry = 0.0  # time.monotonic() after which to refresh
+        self._token_lock = asyncio.Lock()
+        self._client: httpx.AsyncClient | None = None
+        # (drive_id, folder_path) → driveItem ID, kept for the client's lifetime
+        self._item_ids: dict[tuple[str, str], str] = {}
+        # Prefix for coalesce keys, so clients with other credentials never
+        # share a response fetched with this client's token
+        self._identity = (tenant_id, client_id)
 
     # ── Authentication ─────────────────────────────────────────────────────────
 
-    def _get_token(self) -> str:
-        """Acquire an access token using client credentials flow."""
-        app = msal.ConfidentialClientApplication(
-            client_id=self.client_id,
-            client_credential=self.client_secret,
-            authority=f"https://login.microsoftonline.com/{self.tenant_id}",
-        )
-        result = app.acquire_token_for_client(
-            scopes=["https://graph.microsoft.com/.default"]
+    async def _get_token(self) -> str:
+        """Acquire an access token using the client credentials flow."""
+        client = await self._get_client()
+        response = await client.post(
+            self.TOKEN_URL.format(tenant_id=self.tenant_id),
+            data={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "scope": self.GRAPH_SCOPE,
+            },
         )
+        try:
+            result = response.json()
+        except ValueError:
+            # Not an OAuth error body — surface the HTTP status instead
+            response.raise_for_status()
+            raise
+
         if "access_token" not in result:
             error = result.get("error_description", "Unknown error")
             raise ValueError(f"Failed to acquire Graph API token: {error}")
 
+        self._token_expiry = (
+            time.monotonic() + result.get("expires_in", 3600) - self.TOKEN_REFRESH_MARGIN
+        )
         logger.debug("Graph API token acquired successfully")
         return result["access_token"]
 
-    def _headers(self) -> dict:
-        """Return auth headers for Graph API requests."""
-        if not self._token:
-            self._token = self._get_token()
-        return {
-            "Authorization": f"Bearer {self._token}",
-            "Content-Type": "application/json",
-        }
+    def _token_expired(self) -> bool:
+        """Whether there is no token yet or it is within the refresh margin."""
+        return not self._token or time.monotonic() >= self._token_expiry
+
+    async def _headers(self, content_type: str = JSON_CONTENT_TYPE) -> dict:
+        """Return auth headers for Graph API requests, refreshing the token near expiry."""
+        if self._token_expired():
+            # Concurrent requests wait for a single refresh
+            async with self._token_lock:
+                if self._token_expired():
+                    self._token = await self._get_token()
+                    self._auth_header = f"Bearer {self._token}"
+        return {"Authorization": self._auth_header, "Content-Type": content_type}
+
+    # ── HTTP client ────────────────────────────────────────────────────────────
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP/2 client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=self.HTTP_TIMEOUT,
+                headers={"User-Agent": self.USER_AGENT},
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client and its connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _encode_path(self, path: str) -> str:
         """URL encode a path while preserving forward slashes."""
         return quote(path, safe="/")
 
+    # ── Item IDs ───────────────────────────────────────────────────────────────
+    # Folders are addressed by item ID once known, so Graph does not have to
+    # walk the path on every request. IDs are learnt from folder listings
+    # and, failing that, resolved with one lookup per folder.
+
+    async def _resolve(
+        self, drive_id: str, folder_path: str, missing_ok: bool = True
+    ) -> str | None:
+        """
+        Return the item ID of a folder, looking it up on first use.
+
+        Returns None for a folder that does not exist, or raises
+        httpx.HTTPStatusError when missing_ok is False.
+        """
+        key = (drive_id, folder_path)
+        item_id = self._item_ids.get(key)
+        if item_id is not None:
+            return item_id
+
+        # Concurrent misses on a cold cache share one lookup
+        response = await coalesce(
+            ("resolve", *self._identity, drive_id, folder_path),
+            lambda: self._lookup_item(drive_id, folder_path),
+        )
+        if response.status_code == 404 and missing_ok:
+            return None
+        response.raise_for_status()
+
+        item_id = self._item_ids[key] = response.json()["id"]
+        return item_id
+
+    async def _lookup_item(self, drive_id: str, folder_path: str) -> httpx.Response:
+        """Fetch the ID of the item at a path."""
+        encoded_path = self._encode_path(folder_path)
+        url = f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{encoded_path}"
+        client = await self._get_client()
+        return await client.get(
+            url, headers=await self._headers(), params={"$select": "id"}
+        )
+
+    def _forget(self, drive_id: str, folder_path: str) -> None:
+        """Drop a cached item ID that no longer resolves (moved or deleted)."""
+        self._item_ids.pop((drive_id, folder_path), None)
+
+    def _remember_children(
+        self, drive_id: str, folder_path: str, items: list[dict]
+    ) -> None:
+        """Cache the item IDs of the subfolders in a raw Graph listing."""
+        for item in items:
+            if "folder" in item:
+                self._item_ids[(drive_id, f"{folder_path}/{item['name']}")] = item["id"]
+
+    async def _list_children(
+        self, drive_id: str, folder_path: str, missing_ok: bool = True
+    ) -> list[dict] | None:
+        """Raw children of a folder by item ID, or None if it does not exist."""
+        client = await self._get_client()
+
+        # A 404 on a cached ID means the folder moved — resolve it once more
+        for _ in range(2):
+            item_id = await self._resolve(drive_id, folder_path, missing_ok)
+            if item_id is None:
+                return None
+
+            url = f"{self.GRAPH_BASE}/drives/{drive_id}/items/{item_id}/children"
+            response = await client.get(url, headers=await self._headers())
+            if response.status_code == 404:
+                self._forget(drive_id, folder_path)
+                continue
+            response.raise_for_status()
+
+            items = await self._collect_pages(orjson.loads(await response.aread()))
+            self._remember_children(drive_id, folder_path, items)
+            return items
+
+        return None
+
+    async def _collect_pages(self, page: dict) -> list[dict]:
+        """
+        Return the items of a Graph collection page plus every page after it.
+
+        Graph pages folder listings (200 items by default) and links the
+        next page through @odata.nextLink.
+        """
+        items = list(page.get("value", ()))
+        next_link = page.get("@odata.nextLink")
+        if next_link is None:
+            return items
+
+        client = await self._get_client()
+        while next_link:
+            response = await client.get(next_link, headers=await self._headers())
+            response.raise_for_status()
+            page = orjson.loads(await response.aread())
+            items.extend(page.get("value", ()))
+            next_link = page.get("@odata.nextLink")
+        return items
+
+    async def _get_content(
+        self, drive_id: str, folder_path: str, file_name: str, stream: bool
+    ) -> httpx.Response:
+        """
+        Request a file's content, addressing its folder by item ID when known.
+
+        A 404 through a cached folder ID is retried by path in case the
+        folder moved. With stream=True the body is left unread and the
+        caller must close the response.
+        """
+        client = await self._get_client()
+        encoded_name = self._encode_path(file_name)
+        folder_id = await self._resolve(drive_id, folder_path)
+
+        urls = []
+        if folder_id is not None:
+            urls.append(
+                f"{self.GRAPH_BASE}/drives/{drive_id}/items/{folder_id}:/{encoded_name}:/content"
+            )
+        file_path = self._encode_path(f"{folder_path}/{file_name}")
+        urls.append(f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{file_path}:/content")
+
+        for url in urls:
+            request = client.build_request("GET", url, headers=await self._headers())
+            response = await client.send(request, stream=stream, follow_redirects=True)
+            if response.status_code != 404 or url is urls[-1]:
+                return response
+            await response.aclose()
+            self._forget(drive_id, folder_path)
+
+        return response
+
     # ── SharePoint ─────────────────────────────────────────────────────────────
 
     async def download_sharepoint_file(
+        self,
+        drive_id: str,
+        folder_path: str,
+        file_name: str,
+        writer: BinaryIO | None = None,
+    ) -> bytes | None:
+        """
+        Download a file from SharePoint.
+
+        When writer is given the file is streamed into it in chunks and None
+        is returned. Otherwise the file's bytes are returned, and concurrent
+        downloads of the same file share one Graph request.
+        """
+        if writer is not None:
+            await self._stream_file(drive_id, folder_path, file_name, writer)
+            return None
+
+        return await coalesce(
+            ("download", *self._identity, drive_id, folder_path, file_name),
+            lambda: self._download_file(drive_id, folder_path, file_name),
+        )
+
+    async def _download_file(
         self, drive_id: str, folder_path: str, file_name: str
     ) -> bytes:
-        """Download a file from SharePoint and return its bytes."""
-        file_path = self._encode_path(f"{folder_path}/{file_name}")
-        url = f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{file_path}:/content"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url, headers=self._headers(), follow_redirects=True
-            )
+        """Download a SharePoint file into memory and return its bytes."""
+        buffer = BytesIO()
+        await self._stream_file(drive_id, folder_path, file_name, buffer)
+        return buffer.getvalue()
+
+    async def _stream_file(
+        self, drive_id: str, folder_path: str, file_name: str, writer: BinaryIO
+    ) -> None:
+        """Stream a SharePoint file's body into writer in chunks."""
+        response = await self._get_content(
+            drive_id, folder_path, file_name, stream=True
+        )
+        try:
             response.raise_for_status()
-            logger.info(f"Downloaded SharePoint file: {file_name}")
-            return response.content
+            async for chunk in response.aiter_bytes(self.DOWNLOAD_CHUNK_SIZE):
+                writer.write(chunk)
+        finally:
+            await response.aclose()
 
+        logger.info("Downloaded SharePoint file: %s", file_name)
+
+    @graph_cache.ttl_cache()
     async def list_sharepoint_files(
         self, drive_id: str, folder_path: str
     ) -> list[dict]:
         """List files in a SharePoint folder."""
-        encoded_path = self._encode_path(folder_path)
-        url = f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{encoded_path}:/children"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self._headers())
-            response.raise_for_status()
-            items = response.json().get("value", [])
-            return [
-                {"name": item["name"], "id": item["id"]}
-                for item in items
-                if not item.get("folder")
-            ]
+        items = await self._list_children(drive_id, folder_path, missing_ok=False)
+        return [
+            {"name": item["name"], "id": item["id"]}
+            for item in items or []
+            if not item.get("folder")
+        ]
 
+    @graph_cache.ttl_cache()
     async def list_sharepoint_folder(
         self, drive_id: str, folder_path: str
     ) -> list[dict]:
         """List files and folders in a SharePoint folder."""
-        encoded_path = self._encode_path(folder_path)
-        url = f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{encoded_path}:/children"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self._headers())
-            if response.status_code == 404:
-                return []
-            response.raise_for_status()
-            items = response.json().get("value", [])
-            return [
-                {
-                    "name": item["name"],
-                    "id": item["id"],
-                    "is_folder": "folder" in item,
+        items = await self._list_children(drive_id, folder_path)
+        if items is None:
+            return []
+        return [self._folder_item(item) for item in items]
+
+    async def batch(self, requests: list[dict]) -> list[dict]:
+        """
+        Send Graph requests through JSON batching.
+
+        Requests are grouped into batches of up to 20, so N requests cost
+        ceil(N / 20) HTTP round trips instead of N. Graph throttles batched
+        requests individually; throttled ones are retried after their
+        Retry-After delay.
+
+        Args:
+            requests: Dicts with "method" and "url" (relative to the Graph
+                      version root, e.g. /drives/{id}/root/children) and
+                      optional "headers" and "body"
+
+        Returns:
+            One sub-response dict ("status", "headers", "body") per request,
+            in the same order. Requests still throttled after
+            BATCH_MAX_RETRIES come back with their 429 response.
+        """
+        chunks = [
+            requests[i:i + self.BATCH_LIMIT]
+            for i in range(0, len(requests), self.BATCH_LIMIT)
+        ]
+        results = await asyncio.gather(*(self._batch_chunk(chunk) for chunk in chunks))
+        return [response for chunk_responses in results for response in chunk_responses]
+
+    async def _batch_chunk(self, requests: list[dict]) -> list[dict]:
+        """Send one $batch of up to BATCH_LIMIT requests, retrying 429s."""
+        # A sub-response Graph leaves out is treated as a server error
+        responses: list[dict] = [{"status": 500, "body": {}}] * len(requests)
+        pending = list(range(len(requests)))
+        client = await self._get_client()
+
+        for attempt in range(self.BATCH_MAX_RETRIES + 1):
+            body = {"requests": []}
+            for i in pending:
+                sub_request = {
+                    "id": str(i),
+                    "method": requests[i]["method"],
+                    "url": requests[i]["url"],
                 }
-                for item in items
-            ]
+                for key in ("headers", "body"):
+                    if requests[i].get(key) is not None:
+                        sub_request[key] = requests[i][key]
+                body["requests"].append(sub_request)
+
+            response = await client.post(
+                f"{self.GRAPH_BASE}/$batch", headers=await self._headers(), json=body
+            )
+            response.raise_for_status()
+
+            # Graph may answer batched requests in any order
+            data = orjson.loads(await response.aread())
+            by_id = {r["id"]: r for r in data.get("responses", [])}
+            throttled = []
+            retry_after = 0.0
+            for i in pending:
+                sub = by_id.get(str(i))
+                if sub is None:
+                    continue
+                responses[i] = sub
+                if sub.get("status") == 429:
+                    throttled.append(i)
+                    delay = sub.get("headers", {}).get("Retry-After", 1)
+                    retry_after = max(retry_after, float(delay))
+
+            if not throttled:
+                break
+            if attempt == self.BATCH_MAX_RETRIES:
+                logger.warning(
+                    "Gave up on %s throttled Graph batch request(s)", len(throttled)
+                )
+                break
+
+            pending = throttled
+            await asyncio.sleep(min(retry_after, self.BATCH_MAX_RETRY_AFTER))
+
+        logger.debug("Batched %s Graph requests", len(requests))
+        return responses
+
+    async def batch_list_folders(
+        self, drive_id: str, folder_paths: list[str]
+    ) -> list[list[dict] | None]:
+        """
+        List several SharePoint folders in as few round trips as possible.
+
+        Args:
+            drive_id: SharePoint drive ID
+            folder_paths: Folder paths relative to the drive root
+
+        Returns:
+            Folder contents in the same order as folder_paths. Missing
+            folders yield an empty list, as with list_sharepoint_folder;
+            folders that could not be listed yield None.
+        """
+        responses = await self.batch([
+            {
+                "method": "GET",
+                "url": f"/drives/{drive_id}/root:/{self._encode_path(path)}:/children",
+            }
+            for path in folder_paths
+        ])
+
+        results: list[list[dict] | None] = []
+        for folder_path, sub in zip(folder_paths, responses):
+            status = sub.get("status", 500)
+            if status == 404:
+                results.append([])
+            elif status >= 400:
+                error = sub.get("body", {}).get("error", {}).get("message", "")
+                logger.warning(
+                    "Failed to list SharePoint folder %s: %s %s",
+                    folder_path,
+                    status,
+                    error,
+                )
+                results.append(None)
+            else:
+                items = await self._collect_pages(sub.get("body", {}))
+                self._remember_children(drive_id, folder_path, items)
+                results.append([self._folder_item(item) for item in items])
+
+        return results
+
+    @staticmethod
+    def _folder_item(item: dict) -> dict:
+        """Reduce a Graph driveItem to the fields callers use."""
+        return {
+            "name": item["name"],
+            "id": item["id"],
+            "is_folder": "folder" in item,
+        }
 
     async def upload_sharepoint_file(
         self, drive_id: str, folder_path: str, file_name: str, content: bytes
     ) -> str:
         """
         Upload a .docx file to a SharePoint folder.
+        Files over 4 MB go through a resumable upload session.
         Returns the web URL of the uploaded file.
         """
         upload_path = self._encode_path(f"{folder_path}/{file_name}")
-        url = f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{upload_path}:/content"
 
-        headers = self._headers()
-        headers["Content-Type"] = (
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        )
+        if len(content) > self.SIMPLE_UPLOAD_LIMIT:
+            web_url = await self._upload_large_file(drive_id, upload_path, content)
+        else:
+            url = f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{upload_path}:/content"
+
+            headers = await self._headers(content_type=DOCX_CONTENT_TYPE)
 
-        async with httpx.AsyncClient() as client:
+            client = await self._get_client()
             response = await client.put(url, headers=headers, content=content)
             response.raise_for_status()
             web_url = response.json().get("webUrl", "")
-            logger.info(f"Uploaded file to SharePoint: {folder_path}/{file_name}")
-            return web_url
 
-    async def upload_sharepoint_json(
-        self, drive_id: str, folder_path: str, file_name: str, content: str
+        graph_cache.invalidate(drive_id, folder_path)
+        logger.info("Uploaded file to SharePoint: %s/%s", folder_path, file_name)
+        return web_url
+
+    async def _upload_large_file(
+        self, drive_id: str, upload_path: str, content: bytes
     ) -> str:
-        """Upload a JSON file to a SharePoint folder."""
-        upload_path = self._encode_path(f"{folder_path}/{file_name}")
-        url = f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{upload_path}:/content"
+        """
+        Upload content through a Graph upload session in 10 MiB fragments.
 
-        headers = self._headers()
-        headers["Content-Type"] = "application/json"
+        Graph requires fragments of one session to arrive in order, so they
+        are sent one after another. Returns the web URL of the uploaded file.
+        """
+        url = (
+            f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{upload_path}"
+            ":/createUploadSession"
+        )
+        client = await self._get_client()
+        response = await client.post(
+            url,
+            headers=await self._headers(),
+            json={"item": {"@microsoft.graph.conflictBehavior": "replace"}},
+        )
+        response.raise_for_status()
+        upload_url = response.json()["uploadUrl"]
 
-        async with httpx.AsyncClient() as client:
+        view = memoryview(content)
+        total = len(view)
+        for start in range(0, total, self.UPLOAD_FRAGMENT_SIZE):
+            end = min(start + self.UPLOAD_FRAGMENT_SIZE, total)
+            # The upload URL is pre-authenticated — no Authorization header.
+            # An explicit Content-Length keeps httpx from chunking the stream.
             response = await client.put(
-                url, headers=headers, content=content.encode("utf-8")
+                upload_url,
+                headers={
+                    "Content-Length": str(end - start),
+                    "Content-Range": f"bytes {start}-{end - 1}/{total}",
+                },
+                content=self._iter_chunks(view[start:end]),
             )
             response.raise_for_status()
-            logger.info(f"Uploaded JSON to SharePoint: {folder_path}/{file_name}")
-            return response.json().get("webUrl", "")
+
+        logger.debug("Uploaded %s bytes via upload session", total)
+        return response.json().get("webUrl", "")
+
+    async def _iter_chunks(self, view: memoryview) -> AsyncIterator[bytes]:
+        """
+        Stream a slice of a buffer in DOWNLOAD_CHUNK_SIZE pieces.
+
+        Only one small chunk is copied at a time, rather than the whole
+        10 MiB fragment up front.
+        """
+        for start in range(0, len(view), self.DOWNLOAD_CHUNK_SIZE):
+            yield bytes(view[start:start + self.DOWNLOAD_CHUNK_SIZE])
+
+    async def upload_sharepoint_json(
+        self, drive_id: str, folder_path: str, file_name: str, content: str | bytes
+    ) -> str:
+        """Upload a JSON file (text or UTF-8 bytes) to a SharePoint folder."""
+        upload_path = self._encode_path(f"{folder_path}/{file_name}")
+        url = f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{upload_path}:/content"
+
+        headers = await self._headers()
+
+        client = await self._get_client()
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        response = await client.put(url, headers=headers, content=content)
+        response.raise_for_status()
+        graph_cache.invalidate(drive_id, folder_path)
+        logger.info("Uploaded JSON to SharePoint: %s/%s", folder_path, file_name)
+        return response.json().get("webUrl", "")
 
     async def download_sharepoint_json(
         self, drive_id: str, folder_path: str, file_name: str
-    ) -> str:
-        """Download a JSON file from SharePoint and return its text content."""
-        file_path = self._encode_path(f"{folder_path}/{file_name}")
-        url = f"{self.GRAPH_BASE}/drives/{drive_id}/root:/{file_path}:/content"
+    ) -> bytes:
+        """Download a JSON file from SharePoint and return its raw bytes."""
+        return await coalesce(
+            ("download_json", *self._identity, drive_id, folder_path, file_name),
+            lambda: self._download_json(drive_id, folder_path, file_name),
+        )
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url, headers=self._headers(), follow_redirects=True
-            )
-            if response.status_code == 404:
-                return ""
-            response.raise_for_status()
-            return response.text
\ No newline at end of file
+    async def _download_json(
+        self, drive_id: str, folder_path: str, file_name: str
+    ) -> bytes:
+        """Fetch a JSON file's bytes, or b"" when it does not exist."""
+        response = await self._get_content(
+            drive_id, folder_path, file_name, stream=False
+        )
+        if response.status_code == 404:
+            return b""
+        response.raise_for_status()
+        return response.content
@@ -0,0 +1,58 @@
+"""
+Process-wide GraphClient cache for Word MCP Server.
+Lets every action share one client (connection pool and access token)
+per app registration instead of building a new one per tool call.
+"""
+
+import logging
+
+from .graph_client import GraphClient
+
+logger = logging.getLogger(__name__)
+
+_CACHE: dict[tuple[str, str], GraphClient] = {}
+
+
+async def get_graph_client(
+    tenant_id: str, client_id: str, client_secret: str
+) -> GraphClient:
+    """
+    Return the cached GraphClient for an app registration, creating it if needed.
+
+    Args:
+        tenant_id: Azure tenant ID
+        client_id: Azure app registration client ID
+        client_secret: Azure app registration client secret
+
+    Returns:
+        A GraphClient shared by all callers using the same tenant and client ID
+    """
+    key = (tenant_id, client_id)
+    cached = _CACHE.get(key)
+
+    if cached is not None and cached.client_secret == client_secret:
+        return cached
+
+    # Swap the new client in before any await, so concurrent callers all
+    # see it and none of them builds (and leaks) a client of their own
+    graph = GraphClient(
+        tenant_id=tenant_id,
+        client_id=client_id,
+        client_secret=client_secret,
+    )
+    _CACHE[key] = graph
+    logger.debug("Created GraphClient for client %s", client_id)
+
+    if cached is not None:
+        # Secret was rotated — release the stale client's connection pool
+        await cached.aclose()
+
+    return graph
+
+
+async def close_graph_clients() -> None:
+    """Close and forget every cached GraphClient. Called on server shutdown."""
+    while _CACHE:
+        _, graph = _CACHE.popitem()
+        await graph.aclose()
+    logger.info("Closed cached Graph clients")
@@ -0,0 +1,86 @@
+"""
+Project folder state shared by the document actions.
+Lists a project folder once and resolves its latest and next version.
+"""
+
+from dataclasses import dataclass
+from operator import itemgetter
+
+from .graph_client import GraphClient
+from .versions import scan_versions
+
+_NAME = itemgetter("name")
+_IS_FOLDER = itemgetter("is_folder")
+
+
+@dataclass(slots=True)
+class ProjectState:
+    """Where a project lives on SharePoint and which versions it holds."""
+
+    project_folder: str
+    memory_folder: str
+    existing_files: tuple[str, ...]
+    latest_docx: str | None
+    latest_version: int
+    next_filename: str
+
+    @property
+    def latest_memory(self) -> str | None:
+        """Memory JSON filename paired with the latest version, if any."""
+        if self.latest_docx is None:
+            return None
+        return self.latest_docx.replace(".docx", ".json")
+
+
+def file_names(items: list[dict]) -> tuple[str, ...]:
+    """Names of the files (not subfolders) in a folder listing."""
+    return tuple(_NAME(item) for item in items if not _IS_FOLDER(item))
+
+
+def folder_names(items: list[dict]) -> tuple[str, ...]:
+    """Names of the subfolders in a folder listing."""
+    return tuple(_NAME(item) for item in items if _IS_FOLDER(item))
+
+
+async def load_project_state(
+    graph: GraphClient,
+    drive_id: str,
+    base_folder: str,
+    project_name: str,
+    fresh: bool = False,
+) -> ProjectState:
+    """
+    List a project folder and find its latest and next version.
+
+    Args:
+        graph: Graph client used to list the folder
+        drive_id: SharePoint drive holding the output folder
+        base_folder: Output folder that contains every project
+        project_name: The document project name e.g. tender_BSCGlobal
+        fresh: Bypass the listing cache — set when next_filename will be
+               written to, so a version created elsewhere is not overwritten
+
+    Returns:
+        ProjectState for the project — latest_docx is None for a new project
+    """
+    project_folder = f"{base_folder}/{project_name}"
+
+    existing_items = await graph.list_sharepoint_folder(
+        drive_id=drive_id,
+        folder_path=project_folder,
+        fresh=fresh,
+    )
+    existing_files = file_names(existing_items)
+
+    latest_docx, next_filename, latest_version = scan_versions(
+        project_name, existing_files
+    )
+
+    return ProjectState(
+        project_folder=project_folder,
+        memory_folder=f"{project_folder}/Memory",
+        existing_files=existing_files,
+        latest_docx=latest_docx,
+        latest_version=latest_version,
+        next_filename=next_filename,
+    )
@@ -0,0 +1,64 @@
+"""
+Version filename scanning for Word MCP Server.
+Finds the latest and next versioned filename of a project in one pass.
+"""
+
+import functools
+import re
+from collections.abc import Iterable
+
+# Matches versioned outputs e.g. tender_BSCGlobal_v03.docx → ("tender_BSCGlobal", "03")
+_VERSIONED_RE = re.compile(r"^(.+)_v(\d+)\.docx$", re.IGNORECASE)
+
+# Distinct filenames whose parse results are kept
+PARSE_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_version(filename: str) -> tuple[str, int] | None:
+    """
+    Split a versioned filename into its family name and version number.
+
+    e.g. tender_BSCGlobal_v03.docx -> ("tender_BSCGlobal", 3)
+
+    Returns:
+        Tuple of (family name, version number), or None if the filename
+        is not a versioned .docx
+    """
+    match = _VERSIONED_RE.match(filename)
+    if match is None:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def scan_versions(
+    project_name: str, files: Iterable[str]
+) -> tuple[str | None, str, int]:
+    """
+    Scan a project's filenames once for its latest and next version.
+
+    Args:
+        project_name: The document project name e.g. tender_BSCGlobal
+        files: Filenames in the project folder
+
+    Returns:
+        Tuple of (latest version filename or None, next version filename,
+        latest version number or 0 if no versions exist)
+    """
+    target = project_name.lower()
+    latest_name: str | None = None
+    latest_version = 0
+
+    for name in files:
+        if not name.endswith(".docx"):
+            continue
+        parsed = parse_version(name)
+        if parsed is None or parsed[0].lower() != target:
+            continue
+        version = parsed[1]
+        if latest_name is None or version > latest_version:
+            latest_name = name
+            latest_version = version
+
+    next_name = f"{project_name}_v{str(latest_version + 1).zfill(2)}.docx"
+    return latest_name, next_name, latest_version
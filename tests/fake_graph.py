@@ -0,0 +1,91 @@
+"""
+In-memory stand-in for GraphClient and shared helpers for the action tests.
+"""
+
+from io import BytesIO
+from typing import BinaryIO
+
+from docx import Document
+
+# Settings every document action takes, as passed in by register_tools
+SETTINGS = {
+    "azure_tenant_id": "tenant",
+    "azure_client_id": "client",
+    "azure_client_secret": "secret",
+    "sharepoint_drive_id": "drive",
+    "sharepoint_output_folder": "Output",
+}
+
+
+def make_docx(*paragraphs: str) -> bytes:
+    """Build a .docx file containing the given paragraphs."""
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    output = BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+
+class FakeGraphClient:
+    """Serves SharePoint files from a dict and records every call."""
+
+    def __init__(self, files: dict[str, bytes] | None = None):
+        # "folder/path/file.ext" → content
+        self.files: dict[str, bytes] = dict(files or {})
+        self.calls: list[tuple[str, str]] = []
+
+    async def list_sharepoint_folder(
+        self, drive_id: str, folder_path: str, fresh: bool = False
+    ) -> list[dict]:
+        self.calls.append(("list_fresh" if fresh else "list", folder_path))
+        prefix = f"{folder_path}/"
+        names = {
+            path[len(prefix):].split("/")[0]: "/" in path[len(prefix):]
+            for path in self.files
+            if path.startswith(prefix)
+        }
+        return [
+            {"name": name, "id": name, "is_folder": is_folder}
+            for name, is_folder in names.items()
+        ]
+
+    async def download_sharepoint_file(
+        self,
+        drive_id: str,
+        folder_path: str,
+        file_name: str,
+        writer: BinaryIO | None = None,
+    ) -> bytes | None:
+        self.calls.append(("download", f"{folder_path}/{file_name}"))
+        content = self.files[f"{folder_path}/{file_name}"]
+        if writer is not None:
+            writer.write(content)
+            return None
+        return content
+
+    async def download_sharepoint_json(
+        self, drive_id: str, folder_path: str, file_name: str
+    ) -> bytes:
+        self.calls.append(("download_json", f"{folder_path}/{file_name}"))
+        return self.files.get(f"{folder_path}/{file_name}", b"")
+
+    async def upload_sharepoint_file(
+        self, drive_id: str, folder_path: str, file_name: str, content: bytes
+    ) -> str:
+        self.calls.append(("upload", f"{folder_path}/{file_name}"))
+        self.files[f"{folder_path}/{file_name}"] = content
+        return f"https://sharepoint/{folder_path}/{file_name}"
+
+    async def upload_sharepoint_json(
+        self, drive_id: str, folder_path: str, file_name: str, content: str | bytes
+    ) -> str:
+        self.calls.append(("upload_json", f"{folder_path}/{file_name}"))
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self.files[f"{folder_path}/{file_name}"] = content
+        return f"https://sharepoint/{folder_path}/{file_name}"
+
+    def uploads(self) -> list[str]:
+        """Paths written by upload calls, in order."""
+        return [path for kind, path in self.calls if kind.startswith("upload")]
@@ -10,6 +10,14 @@ import pytest
 from src.config import load_config
 
 
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Reload configuration from the patched environment in every test."""
+    load_config.cache_clear()
+    yield
+    load_config.cache_clear()
+
+
 def test_load_config_success():
     """Test successful config loading with all required environment variables."""
     with patch.dict(
@@ -0,0 +1,145 @@
+"""
+Unit tests for utils/docx_utils.py
+"""
+
+from io import BytesIO
+
+import pytest
+from docx import Document
+
+from src.utils import docx_utils
+from src.utils.docx_utils import (
+    deserialize_context,
+    find_and_replace,
+    render_template,
+    render_prepared,
+    render_template_async,
+    scan_and_prepare,
+    scan_placeholders,
+    serialize_context,
+)
+from tests.fake_graph import make_docx
+
+
+def test_serialize_context_returns_sorted_utf8_bytes():
+    """Test context is serialized to indented UTF-8 JSON bytes with sorted keys."""
+    data = serialize_context({"zeta": "Zürich", "alpha": 1})
+
+    assert isinstance(data, bytes)
+    assert data == b'{\n  "alpha": 1,\n  "zeta": "Z\xc3\xbcrich"\n}'
+
+
+def test_serialize_context_stringifies_non_str_keys():
+    """Test non-string keys are written as strings, as the stdlib json module does."""
+    assert deserialize_context(serialize_context({1: "one", "b": {2: True}})) == {
+        "1": "one",
+        "b": {"2": True},
+    }
+
+
+def test_deserialize_context_accepts_bytes_and_text():
+    """Test Memory JSON can be read from raw bytes or decoded text."""
+    context = {"company_name": "BSC Global", "date": "2026-02-28"}
+    data = serialize_context(context)
+
+    assert deserialize_context(data) == context
+    assert deserialize_context(data.decode("utf-8")) == context
+
+
+def test_deserialize_context_empty():
+    """Test a missing Memory file deserializes to an empty context."""
+    assert deserialize_context(b"") == {}
+    assert deserialize_context("") == {}
+
+
+def test_scan_placeholders_reads_paragraphs_and_tables():
+    """Test placeholders are found in body text, table cells and split runs."""
+    doc = Document()
+    doc.add_paragraph("Dear {{ company }}, {{date}}")
+    para = doc.add_paragraph("Signed: {{ sig")
+    para.add_run("natory }}")
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "Total: {{ amount }}"
+    output = BytesIO()
+    doc.save(output)
+
+    assert scan_placeholders(output.getvalue()) == [
+        "amount", "company", "date", "signatory",
+    ]
+
+
+def test_find_and_replace_accepts_stream():
+    """Test find and replace reads a .docx from a stream as well as bytes."""
+    source = BytesIO(make_docx("Dear ACME team", "Regards"))
+    source.seek(0, 2)  # Left at the end, as after a streamed download
+
+    updated, count = find_and_replace(source, "ACME", "BSC Global")
+
+    assert count == 1
+    assert Document(BytesIO(updated)).paragraphs[0].text == "Dear BSC Global team"
+
+
+def test_find_and_replace_updates_table_cells():
+    """Test find and replace reaches runs inside table cells."""
+    doc = Document()
+    doc.add_paragraph("ACME proposal")
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "Client: ACME"
+    output = BytesIO()
+    doc.save(output)
+
+    updated, count = find_and_replace(output.getvalue(), "ACME", "BSC")
+
+    result = Document(BytesIO(updated))
+    assert count == 2
+    assert result.paragraphs[0].text == "BSC proposal"
+    assert result.tables[0].cell(0, 0).text == "Client: BSC"
+
+
+def test_render_template_reuses_compiled_template():
+    """Test rendering the same template twice compiles its Jinja source once."""
+    template = make_docx("Dear {{ company_name }}", "Date: {{ date }}")
+    docx_utils._JINJA_ENV._template_cache.cache_clear()
+
+    first = render_template(template, {"company_name": "ACME", "date": "today"})
+    second = render_template(template, {"company_name": "BSC Global"})
+
+    info = docx_utils._JINJA_ENV._template_cache.cache_info()
+    assert info.hits >= 1
+    assert [p.text for p in Document(BytesIO(first)).paragraphs] == [
+        "Dear ACME",
+        "Date: today",
+    ]
+    assert [p.text for p in Document(BytesIO(second)).paragraphs] == [
+        "Dear BSC Global",
+        "Date: ",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_render_template_async_matches_sync():
+    """Test the thread-offloaded render produces the same document."""
+    template = make_docx("Dear {{ company }} team")
+
+    rendered = await render_template_async(template, {"company": "BSC Global"})
+
+    assert Document(BytesIO(rendered)).paragraphs[0].text == "Dear BSC Global team"
+
+
+def test_scan_and_prepare_then_render_parses_once():
+    """Test variables are read from the Jinja AST and the same template renders."""
+    doc = Document()
+    doc.add_paragraph("Dear {{ company|upper }}, {{ contact.name }}")
+    doc.add_paragraph("{% for item in items %}{{ item }} {% endfor %}")
+    doc.sections[0].header.paragraphs[0].text = "Ref {{ ref }}"
+    output = BytesIO()
+    doc.save(output)
+
+    variables, tpl = scan_and_prepare(output.getvalue())
+    rendered = render_prepared(
+        tpl,
+        {"company": "bsc", "contact": {"name": "Ann"}, "items": ["a", "b"], "ref": "R1"},
+    )
+
+    assert variables == ["company", "contact", "items", "ref"]
+    result = Document(BytesIO(rendered))
+    assert result.paragraphs[0].text == "Dear BSC, Ann"
+    assert result.sections[0].header.paragraphs[0].text == "Ref R1"
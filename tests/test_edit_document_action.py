@@ -0,0 +1,56 @@
+"""
+Unit tests for actions/edit_document.py
+"""
+
+from io import BytesIO
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from docx import Document
+
+from src.actions.edit_document import edit_document_action
+from src.utils.docx_utils import deserialize_context, serialize_context
+from tests.fake_graph import SETTINGS, FakeGraphClient, make_docx
+
+
+@pytest.mark.asyncio
+async def test_edit_document_saves_next_version_and_carries_memory():
+    """Test an edit saves the next version and copies the Memory JSON forward."""
+    graph = FakeGraphClient({
+        "Output/proj/proj_v01.docx": make_docx("Dear ACME team"),
+        "Output/proj/Memory/proj_v01.json": serialize_context({"company": "ACME"}),
+    })
+
+    with patch(
+        "src.actions.edit_document.get_graph_client",
+        new=AsyncMock(return_value=graph),
+    ):
+        result = await edit_document_action(
+            project_name="proj", find_text="ACME", replace_text="BSC Global",
+            **SETTINGS,
+        )
+
+    assert "proj_v02.docx" in result
+    updated = Document(BytesIO(graph.files["Output/proj/proj_v02.docx"]))
+    assert updated.paragraphs[0].text == "Dear BSC Global team"
+    assert deserialize_context(graph.files["Output/proj/Memory/proj_v02.json"]) == {
+        "company": "ACME"
+    }
+
+
+@pytest.mark.asyncio
+async def test_edit_document_text_not_found_uploads_nothing():
+    """Test no version is created when the text is not in the document."""
+    graph = FakeGraphClient({"Output/proj/proj_v01.docx": make_docx("Hello")})
+
+    with patch(
+        "src.actions.edit_document.get_graph_client",
+        new=AsyncMock(return_value=graph),
+    ):
+        result = await edit_document_action(
+            project_name="proj", find_text="ACME", replace_text="BSC",
+            **SETTINGS,
+        )
+
+    assert "was not found" in result
+    assert graph.uploads() == []
@@ -0,0 +1,100 @@
+"""
+Unit tests for actions/fill_template.py
+"""
+
+from io import BytesIO
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from docx import Document
+
+from src.actions.fill_template import fill_template_action
+from src.utils.docx_utils import deserialize_context, serialize_context
+from tests.fake_graph import SETTINGS, FakeGraphClient, make_docx
+
+
+async def fill(graph: FakeGraphClient, replacements: dict) -> str:
+    """Run fill_template_action against the fake Graph client."""
+    with patch(
+        "src.actions.fill_template.get_graph_client",
+        new=AsyncMock(return_value=graph),
+    ):
+        return await fill_template_action(
+            template_name="t.docx", project_name="proj",
+            replacements=replacements, sharepoint_template_folder="Templates",
+            **SETTINGS,
+        )
+
+
+def existing_project() -> FakeGraphClient:
+    """Fake Graph client holding a template and one saved project version."""
+    return FakeGraphClient({
+        "Templates/t.docx": make_docx("Dear {{ company }} team"),
+        "Output/proj/proj_v01.docx": make_docx("Dear ACME team"),
+        "Output/proj/Memory/proj_v01.json": serialize_context({"company": "ACME"}),
+    })
+
+
+@pytest.mark.asyncio
+async def test_fill_template_existing_project_without_replacements_skips_download():
+    """Test an empty fill of an existing project returns before fetching the template."""
+    graph = existing_project()
+
+    result = await fill(graph, {})
+
+    assert "No new replacements" in result
+    assert ("download", "Templates/t.docx") not in graph.calls
+    assert graph.uploads() == []
+
+
+@pytest.mark.asyncio
+async def test_fill_template_unchanged_values_create_no_version():
+    """Test replacements matching the saved context create no new version."""
+    graph = existing_project()
+
+    result = await fill(graph, {"company": "ACME"})
+
+    assert "already match proj_v01.docx" in result
+    assert graph.uploads() == []
+
+
+@pytest.mark.asyncio
+async def test_fill_template_new_project_without_replacements_renders():
+    """Test a new project with no replacements still renders the template."""
+    graph = FakeGraphClient({
+        "Templates/t.docx": make_docx("Dear {{ company }} team"),
+    })
+
+    result = await fill(graph, {})
+
+    assert "proj_v01.docx" in result
+    assert graph.uploads() == [
+        "Output/proj/proj_v01.docx",
+        "Output/proj/Memory/proj_v01.json",
+    ]
+    rendered = Document(BytesIO(graph.files["Output/proj/proj_v01.docx"]))
+    assert rendered.paragraphs[0].text == "Dear  team"
+    assert deserialize_context(graph.files["Output/proj/Memory/proj_v01.json"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_fill_template_merges_new_values_into_next_version():
+    """Test new replacements are merged over the saved context into v02."""
+    graph = existing_project()
+
+    result = await fill(graph, {"company": "BSC Global"})
+
+    assert "proj_v02.docx" in result
+    rendered = Document(BytesIO(graph.files["Output/proj/proj_v02.docx"]))
+    assert rendered.paragraphs[0].text == "Dear BSC Global team"
+
+
+@pytest.mark.asyncio
+async def test_fill_template_lists_project_fresh_before_writing():
+    """Test the version to write is picked from an uncached folder listing."""
+    graph = existing_project()
+
+    await fill(graph, {"company": "BSC Global"})
+
+    assert ("list_fresh", "Output/proj") in graph.calls
+    assert ("list", "Output/proj") not in graph.calls
@@ -0,0 +1,108 @@
+"""
+Unit tests for utils/graph_cache.py
+"""
+
+import asyncio
+
+import pytest
+
+from src.utils import graph_cache
+
+
+class FakeLister:
+    """Stand-in for GraphClient that counts listing calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    @graph_cache.ttl_cache(ttl=30)
+    async def list_folder(self, drive_id: str, folder_path: str) -> list:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return [{"name": f"{folder_path}/file_{self.calls}.docx"}]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty listing cache."""
+    graph_cache.clear()
+    yield
+    graph_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_reuses_listing():
+    """Test repeated listings of the same folder hit Graph once."""
+    lister = FakeLister()
+
+    first = await lister.list_folder(drive_id="drive", folder_path="Output/proj")
+    second = await lister.list_folder(drive_id="drive", folder_path="Output/proj")
+
+    assert first == second
+    assert lister.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_fresh_bypasses_and_refreshes_cache():
+    """Test fresh=True always lists from Graph and stores the new listing."""
+    lister = FakeLister()
+
+    await lister.list_folder("drive", "Output/proj")
+    fresh = await lister.list_folder("drive", "Output/proj", fresh=True)
+    cached = await lister.list_folder("drive", "Output/proj")
+
+    assert lister.calls == 2
+    assert cached == fresh == [{"name": "Output/proj/file_2.docx"}]
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_coalesces_concurrent_misses():
+    """Test concurrent misses for one folder share a single Graph call."""
+    lister = FakeLister()
+
+    results = await asyncio.gather(
+        *(lister.list_folder("drive", "Output/proj") for _ in range(5))
+    )
+
+    assert lister.calls == 1
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_expires(monkeypatch):
+    """Test listings are fetched again once the TTL has passed."""
+    lister = FakeLister()
+    now = [1000.0]
+    monkeypatch.setattr(graph_cache.time, "monotonic", lambda: now[0])
+
+    await lister.list_folder("drive", "Output/proj")
+    now[0] += 31
+    await lister.list_folder("drive", "Output/proj")
+
+    assert lister.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_folder_and_ancestors():
+    """Test a write invalidates the folder and its parents but not siblings."""
+    lister = FakeLister()
+    for path in ["Output", "Output/proj", "Output/proj/Memory", "Output/other"]:
+        await lister.list_folder("drive", path)
+
+    graph_cache.invalidate("drive", "Output/proj/Memory")
+
+    for path in ["Output", "Output/proj", "Output/proj/Memory", "Output/other"]:
+        await lister.list_folder("drive", path)
+
+    # Three invalidated folders were listed again, the sibling was not
+    assert lister.calls == 7
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_drops_locks_after_fill():
+    """Test per-folder locks are released once the listing is cached."""
+    lister = FakeLister()
+
+    await asyncio.gather(*(lister.list_folder("drive", "Output/proj") for _ in range(3)))
+
+    assert graph_cache._locks == {}
@@ -0,0 +1,493 @@
+"""
+Unit tests for utils/graph_client.py
+"""
+
+import asyncio
+import io
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.utils import graph_cache
+from src.utils.graph_client import DOCX_CONTENT_TYPE, GraphClient
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty listing cache."""
+    graph_cache.clear()
+    yield
+    graph_cache.clear()
+
+
+def make_graph(handler, client_id: str = "client") -> GraphClient:
+    """Build a GraphClient whose HTTP traffic is served by handler."""
+    graph = GraphClient(tenant_id="tenant", client_id=client_id, client_secret="secret")
+    graph._token = f"{client_id}_token"
+    graph._auth_header = f"Bearer {client_id}_token"
+    graph._token_expiry = float("inf")
+    graph._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return graph
+
+
+@pytest.mark.asyncio
+async def test_batch_list_folders_preserves_order_and_chunks():
+    """Test batch listing splits into 20-request batches and keeps input order."""
+    batch_sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1.0/$batch"
+        requests = json.loads(request.content)["requests"]
+        batch_sizes.append(len(requests))
+        # Answer in reverse order to check results are re-ordered by id
+        responses = [
+            {
+                "id": r["id"],
+                "status": 200,
+                "body": {"value": [{"name": r["url"], "id": r["id"]}]},
+            }
+            for r in reversed(requests)
+        ]
+        return httpx.Response(200, json={"responses": responses})
+
+    graph = make_graph(handler)
+    paths = [f"Output/project_{i}" for i in range(25)]
+
+    results = await graph.batch_list_folders(drive_id="drive", folder_paths=paths)
+
+    assert sorted(batch_sizes) == [5, 20]
+    assert len(results) == 25
+    for path, items in zip(paths, results):
+        assert items == [
+            {
+                "name": f"/drives/drive/root:/{path}:/children",
+                "id": items[0]["id"],
+                "is_folder": False,
+            }
+        ]
+
+
+@pytest.mark.asyncio
+async def test_batch_forwards_requests_and_returns_sub_responses_in_order():
+    """Test the generic batch helper passes method, url, headers and body through."""
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests = json.loads(request.content)["requests"]
+        sent.extend(requests)
+        return httpx.Response(200, json={"responses": [
+            {"id": r["id"], "status": 200 + int(r["id"]), "body": {}}
+            for r in reversed(requests)
+        ]})
+
+    graph = make_graph(handler)
+
+    responses = await graph.batch([
+        {"method": "GET", "url": "/me"},
+        {
+            "method": "PATCH",
+            "url": "/drives/d/items/1",
+            "headers": {"Content-Type": "application/json"},
+            "body": {"name": "new.docx"},
+        },
+    ])
+
+    assert [r["status"] for r in responses] == [200, 201]
+    assert sent == [
+        {"id": "0", "method": "GET", "url": "/me"},
+        {
+            "id": "1",
+            "method": "PATCH",
+            "url": "/drives/d/items/1",
+            "headers": {"Content-Type": "application/json"},
+            "body": {"name": "new.docx"},
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_list_folders_missing_folder_is_empty():
+    """Test a 404 inside a batch yields an empty listing for that folder."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, json={"responses": [{"id": "0", "status": 404, "body": {}}]}
+        )
+
+    graph = make_graph(handler)
+
+    results = await graph.batch_list_folders(drive_id="drive", folder_paths=["Gone"])
+
+    assert results == [[]]
+
+
+@pytest.mark.asyncio
+async def test_batch_list_folders_failed_request_is_none():
+    """Test a non-404 error inside a batch yields None for just that folder."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={
+                "responses": [
+                    {
+                        "id": "0",
+                        "status": 403,
+                        "body": {"error": {"message": "Access denied"}},
+                    },
+                    {"id": "1", "status": 200, "body": {"value": []}},
+                ]
+            },
+        )
+
+    graph = make_graph(handler)
+
+    results = await graph.batch_list_folders(
+        drive_id="drive", folder_paths=["Secret", "Open"]
+    )
+
+    assert results == [None, []]
+
+
+@pytest.mark.asyncio
+async def test_batch_list_folders_retries_throttled_requests():
+    """Test throttled batch requests are resent alone after Retry-After."""
+    sent_ids = []
+    sleeps = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = [r["id"] for r in json.loads(request.content)["requests"]]
+        sent_ids.append(ids)
+        responses = []
+        for request_id in ids:
+            if request_id == "1" and len(sent_ids) == 1:
+                responses.append(
+                    {"id": "1", "status": 429, "headers": {"Retry-After": "2"}}
+                )
+            else:
+                item = {"name": f"f{request_id}.docx", "id": request_id}
+                responses.append(
+                    {"id": request_id, "status": 200, "body": {"value": [item]}}
+                )
+        return httpx.Response(200, json={"responses": responses})
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    graph = make_graph(handler)
+
+    with patch("src.utils.graph_client.asyncio.sleep", fake_sleep):
+        results = await graph.batch_list_folders(
+            drive_id="drive", folder_paths=["A", "B"]
+        )
+
+    assert sent_ids == [["0", "1"], ["1"]]
+    assert sleeps == [2.0]
+    assert [items[0]["name"] for items in results] == ["f0.docx", "f1.docx"]
+
+
+@pytest.mark.asyncio
+async def test_download_sharepoint_file_streams_into_writer():
+    """Test downloads can be streamed straight into a caller-supplied buffer."""
+    body = b"x" * (GraphClient.DOWNLOAD_CHUNK_SIZE * 3 + 7)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/root:/Templates"):
+            return httpx.Response(200, json={"id": "templates-id"})
+        assert request.url.path.endswith("/items/templates-id:/t.docx:/content")
+        return httpx.Response(200, content=body)
+
+    graph = make_graph(handler)
+    buffer = io.BytesIO()
+
+    result = await graph.download_sharepoint_file(
+        drive_id="drive", folder_path="Templates", file_name="t.docx", writer=buffer
+    )
+
+    assert result is None
+    assert buffer.getvalue() == body
+    assert await graph.download_sharepoint_file(
+        drive_id="drive", folder_path="Templates", file_name="t.docx"
+    ) == body
+
+
+@pytest.mark.asyncio
+async def test_concurrent_downloads_share_one_request():
+    """Test identical in-flight downloads are coalesced into one Graph request."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/root:/Templates"):
+            return httpx.Response(200, json={"id": "templates-id"})
+        requests.append(request.url.path)
+        return httpx.Response(200, content=b"template")
+
+    graph = make_graph(handler)
+
+    results = await asyncio.gather(
+        graph.download_sharepoint_file("drive", "Templates", "t.docx"),
+        graph.download_sharepoint_file("drive", "Templates", "t.docx"),
+    )
+
+    assert results == [b"template", b"template"]
+    assert len(requests) == 1
+
+    # Completed downloads are not reused
+    await graph.download_sharepoint_file("drive", "Templates", "t.docx")
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_downloads_are_not_shared_across_clients():
+    """Test clients with different credentials each fetch with their own token."""
+    tokens = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/root:/Templates"):
+            return httpx.Response(200, json={"id": "templates-id"})
+        tokens.append(request.headers["Authorization"])
+        return httpx.Response(200, content=b"template")
+
+    graph = make_graph(handler)
+    other = make_graph(handler, client_id="other")
+
+    await asyncio.gather(
+        graph.download_sharepoint_file("drive", "Templates", "t.docx"),
+        other.download_sharepoint_file("drive", "Templates", "t.docx"),
+    )
+
+    assert sorted(tokens) == ["Bearer client_token", "Bearer other_token"]
+
+
+@pytest.mark.asyncio
+async def test_upload_sharepoint_file_sends_docx_content_type():
+    """Test small uploads are one PUT carrying the auth and .docx content-type headers."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(201, json={"webUrl": "https://sharepoint/doc.docx"})
+
+    graph = make_graph(handler)
+
+    web_url = await graph.upload_sharepoint_file(
+        drive_id="drive", folder_path="Output/proj", file_name="proj_v01.docx",
+        content=b"docx",
+    )
+
+    assert web_url == "https://sharepoint/doc.docx"
+    assert seen[0].method == "PUT"
+    assert seen[0].headers["Authorization"] == "Bearer client_token"
+    assert seen[0].headers["Content-Type"] == DOCX_CONTENT_TYPE
+
+
+@pytest.mark.asyncio
+async def test_upload_sharepoint_file_uses_upload_session_for_large_files():
+    """Test files over 4 MB are uploaded in ordered fragments via an upload session."""
+    content = bytes(range(256)) * ((GraphClient.UPLOAD_FRAGMENT_SIZE + 1234) // 256)
+    ranges = []
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith(":/createUploadSession"):
+            return httpx.Response(200, json={"uploadUrl": "https://upload.example/s1"})
+        assert request.url.host == "upload.example"
+        assert "Authorization" not in request.headers
+        assert "Transfer-Encoding" not in request.headers
+        assert int(request.headers["Content-Length"]) == len(request.content)
+        received.append(request.content)
+        ranges.append(request.headers["Content-Range"])
+        if len(ranges) < 2:
+            return httpx.Response(202, json={"nextExpectedRanges": []})
+        return httpx.Response(201, json={"webUrl": "https://sharepoint/doc.docx"})
+
+    graph = make_graph(handler)
+
+    web_url = await graph.upload_sharepoint_file(
+        drive_id="drive", folder_path="Output/proj", file_name="proj_v01.docx",
+        content=content,
+    )
+
+    size = GraphClient.UPLOAD_FRAGMENT_SIZE
+    assert ranges == [
+        f"bytes 0-{size - 1}/{len(content)}",
+        f"bytes {size}-{len(content) - 1}/{len(content)}",
+    ]
+    assert b"".join(received) == content
+    assert web_url == "https://sharepoint/doc.docx"
+
+
+def make_token_graph(tokens: list[str], requests: list) -> GraphClient:
+    """Build a GraphClient whose token endpoint hands out tokens in order."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200, json={"access_token": tokens[len(requests) - 1], "expires_in": 3600}
+        )
+
+    graph = GraphClient(tenant_id="tenant", client_id="client", client_secret="secret")
+    graph._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return graph
+
+
+@pytest.mark.asyncio
+async def test_headers_refreshes_token_near_expiry():
+    """Test a long-lived client fetches a new token once the old one expires."""
+    requests = []
+    graph = make_token_graph(["first", "second"], requests)
+    now = [1000.0]
+
+    with patch("src.utils.graph_client.time.monotonic", lambda: now[0]):
+        assert (await graph._headers())["Authorization"] == "Bearer first"
+
+        # Still valid — the cached token is reused
+        now[0] += 3000
+        assert (await graph._headers())["Authorization"] == "Bearer first"
+
+        # Within the refresh margin of expiry — a new token is acquired
+        now[0] += 560
+        assert (await graph._headers())["Authorization"] == "Bearer second"
+
+    assert len(requests) == 2
+    assert str(requests[0].url) == (
+        "https://login.microsoftonline.com/tenant/oauth2/v2.0/token"
+    )
+    form = dict(httpx.QueryParams(requests[0].content.decode()))
+    assert form == {
+        "grant_type": "client_credentials",
+        "client_id": "client",
+        "client_secret": "secret",
+        "scope": "https://graph.microsoft.com/.default",
+    }
+
+
+@pytest.mark.asyncio
+async def test_token_error_raises_value_error():
+    """Test an OAuth error response is reported with its description."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            401,
+            json={"error": "invalid_client", "error_description": "Bad secret"},
+        )
+
+    graph = GraphClient(tenant_id="tenant", client_id="client", client_secret="secret")
+    graph._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with pytest.raises(ValueError, match="Bad secret"):
+        await graph._headers()
+
+
+@pytest.mark.asyncio
+async def test_listings_address_folders_by_cached_item_id():
+    """Test folders are resolved once, then listed and seeded by item ID."""
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        paths.append(path)
+        if path.endswith("/root:/Output"):
+            return httpx.Response(200, json={"id": "output-id"})
+        if path.endswith("/items/output-id/children"):
+            return httpx.Response(
+                200, json={"value": [{"name": "proj", "id": "proj-id", "folder": {}}]}
+            )
+        if path.endswith("/items/proj-id/children"):
+            return httpx.Response(200, json={"value": []})
+        return httpx.Response(404)
+
+    graph = make_graph(handler)
+
+    assert await graph.list_sharepoint_folder("drive", "Output") == [
+        {"name": "proj", "id": "proj-id", "is_folder": True}
+    ]
+    # The project folder's ID came from the parent listing — no lookup needed
+    assert await graph.list_sharepoint_folder("drive", "Output/proj") == []
+    assert [p.rsplit("/", 2)[-2:] for p in paths] == [
+        ["root:", "Output"],
+        ["output-id", "children"],
+        ["proj-id", "children"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stale_item_id_is_resolved_again():
+    """Test a 404 through a cached item ID re-resolves the folder by path."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/root:/Output/proj"):
+            return httpx.Response(200, json={"id": "new-id"})
+        if path.endswith("/items/new-id/children"):
+            return httpx.Response(200, json={"value": [{"name": "a.docx", "id": "1"}]})
+        return httpx.Response(404)
+
+    graph = make_graph(handler)
+    graph._item_ids[("drive", "Output/proj")] = "old-id"
+
+    items = await graph.list_sharepoint_folder("drive", "Output/proj")
+
+    assert [item["name"] for item in items] == ["a.docx"]
+    assert graph._item_ids[("drive", "Output/proj")] == "new-id"
+
+
+@pytest.mark.asyncio
+async def test_list_missing_folder_returns_empty():
+    """Test a folder that cannot be resolved lists as empty."""
+    graph = make_graph(lambda request: httpx.Response(404))
+
+    assert await graph.list_sharepoint_folder("drive", "Output/new") == []
+    assert ("drive", "Output/new") not in graph._item_ids
+
+
+@pytest.mark.asyncio
+async def test_concurrent_headers_share_one_token_refresh():
+    """Test concurrent requests wait for one token fetch instead of racing."""
+    requests = []
+    graph = make_token_graph(["token"], requests)
+
+    headers = await asyncio.gather(*(graph._headers() for _ in range(5)))
+
+    assert {h["Authorization"] for h in headers} == {"Bearer token"}
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_resolves_share_one_lookup():
+    """Test a cold item-ID cache is filled by one lookup for concurrent callers."""
+    lookups = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        lookups.append(request.url.path)
+        return httpx.Response(200, json={"id": "templates-id"})
+
+    graph = make_graph(handler)
+
+    ids = await asyncio.gather(*(graph._resolve("drive", "Templates") for _ in range(4)))
+
+    assert ids == ["templates-id"] * 4
+    assert len(lookups) == 1
+
+
+@pytest.mark.asyncio
+async def test_listing_follows_next_links():
+    """Test folder listings gather every page linked by @odata.nextLink."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/root:/Output"):
+            return httpx.Response(200, json={"id": "output-id"})
+        if request.url.params.get("page") == "2":
+            return httpx.Response(200, json={"value": [{"name": "b.docx", "id": "2"}]})
+        return httpx.Response(200, json={
+            "value": [{"name": "a.docx", "id": "1"}],
+            "@odata.nextLink": "https://graph.microsoft.com/v1.0/next?page=2",
+        })
+
+    graph = make_graph(handler)
+
+    items = await graph.list_sharepoint_folder("drive", "Output")
+
+    assert [item["name"] for item in items] == ["a.docx", "b.docx"]
@@ -0,0 +1,74 @@
+"""
+Unit tests for utils/graph_client_cache.py
+"""
+
+import asyncio
+
+import pytest
+
+from src.utils import graph_client_cache
+from src.utils.graph_client_cache import close_graph_clients, get_graph_client
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty client cache."""
+    graph_client_cache._CACHE.clear()
+    yield
+    graph_client_cache._CACHE.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_graph_client_reuses_instance():
+    """Test the same app registration always gets the same GraphClient."""
+    first = await get_graph_client("tenant", "client", "secret")
+    second = await get_graph_client("tenant", "client", "secret")
+
+    assert first is second
+
+
+@pytest.mark.asyncio
+async def test_get_graph_client_separates_registrations():
+    """Test different client IDs get different GraphClients."""
+    first = await get_graph_client("tenant", "client_a", "secret")
+    second = await get_graph_client("tenant", "client_b", "secret")
+
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_get_graph_client_replaces_on_secret_rotation():
+    """Test a changed client secret replaces the cached GraphClient."""
+    first = await get_graph_client("tenant", "client", "old_secret")
+    second = await get_graph_client("tenant", "client", "new_secret")
+
+    assert first is not second
+    assert second.client_secret == "new_secret"
+
+
+@pytest.mark.asyncio
+async def test_close_graph_clients_empties_cache():
+    """Test shutdown closes HTTP clients and empties the cache."""
+    graph = await get_graph_client("tenant", "client", "secret")
+    http_client = await graph._get_client()
+
+    await close_graph_clients()
+
+    assert http_client.is_closed
+    assert graph_client_cache._CACHE == {}
+
+
+@pytest.mark.asyncio
+async def test_secret_rotation_swaps_before_closing():
+    """Test concurrent callers after a secret rotation share one new client."""
+    old = await get_graph_client("tenant", "client", "old_secret")
+    old_http = await old._get_client()
+
+    first, second = await asyncio.gather(
+        get_graph_client("tenant", "client", "new_secret"),
+        get_graph_client("tenant", "client", "new_secret"),
+    )
+
+    assert first is second
+    assert graph_client_cache._CACHE[("tenant", "client")] is first
+    assert old_http.is_closed
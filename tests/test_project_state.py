@@ -0,0 +1,38 @@
+"""
+Unit tests for utils/project_state.py
+"""
+
+import pytest
+
+from src.utils.project_state import load_project_state
+from tests.fake_graph import FakeGraphClient
+
+
+@pytest.mark.asyncio
+async def test_load_project_state_finds_latest_and_next_version():
+    """Test the latest version, its Memory file and the next name are resolved."""
+    graph = FakeGraphClient({
+        "Output/proj/proj_v01.docx": b"",
+        "Output/proj/proj_v02.docx": b"",
+        "Output/proj/Memory/proj_v02.json": b"{}",
+    })
+
+    state = await load_project_state(graph, "drive", "Output", "proj")
+
+    assert state.project_folder == "Output/proj"
+    assert state.memory_folder == "Output/proj/Memory"
+    assert state.existing_files == ("proj_v01.docx", "proj_v02.docx")
+    assert state.latest_docx == "proj_v02.docx"
+    assert state.latest_memory == "proj_v02.json"
+    assert state.latest_version == 2
+    assert state.next_filename == "proj_v03.docx"
+
+
+@pytest.mark.asyncio
+async def test_load_project_state_new_project():
+    """Test a missing project folder yields no latest version and v01 next."""
+    state = await load_project_state(FakeGraphClient(), "drive", "Output", "proj")
+
+    assert state.latest_docx is None
+    assert state.latest_memory is None
+    assert state.next_filename == "proj_v01.docx"
@@ -0,0 +1,69 @@
+"""
+Unit tests for utils/versions.py
+"""
+
+from src.utils.docx_utils import (
+    get_family_name,
+    get_latest_version_filename,
+    get_version_number,
+    next_version_filename,
+)
+from src.utils.versions import parse_version, scan_versions
+
+
+def test_scan_versions_finds_latest_and_next():
+    """Test a single scan returns the latest file, next file and latest version."""
+    files = [
+        "tender_BSCGlobal_v01.docx",
+        "tender_BSCGlobal_v03.docx",
+        "tender_BSCGlobal_v02.docx",
+        "tender_NedBank_v07.docx",
+        "tender_BSCGlobal_v04.json",
+        "notes.txt",
+    ]
+
+    latest, next_name, version = scan_versions("tender_BSCGlobal", files)
+
+    assert latest == "tender_BSCGlobal_v03.docx"
+    assert next_name == "tender_BSCGlobal_v04.docx"
+    assert version == 3
+
+
+def test_scan_versions_matches_family_case_insensitively():
+    """Test project names match regardless of case."""
+    latest, next_name, version = scan_versions(
+        "tender_bscglobal", ["TENDER_BSCGlobal_v09.docx"]
+    )
+
+    assert latest == "TENDER_BSCGlobal_v09.docx"
+    assert next_name == "tender_bscglobal_v10.docx"
+    assert version == 9
+
+
+def test_scan_versions_new_project():
+    """Test a project with no versions starts at v01."""
+    latest, next_name, version = scan_versions("tender_New", ["other_v01.docx"])
+
+    assert latest is None
+    assert next_name == "tender_New_v01.docx"
+    assert version == 0
+
+
+def test_legacy_helpers_agree_with_scan_versions():
+    """Test the old helper functions return the same results as scan_versions."""
+    files = ["proj_v01.docx", "proj_v12.docx", "proj_v02.docx"]
+
+    assert get_latest_version_filename("proj", files) == "proj_v12.docx"
+    assert next_version_filename("proj", files) == "proj_v13.docx"
+
+
+def test_parse_version_and_helpers():
+    """Test filenames are split into family and version by one shared parse."""
+    assert parse_version("tender_BSCGlobal_v03.docx") == ("tender_BSCGlobal", 3)
+    assert parse_version("my_v1_notes_v12.DOCX") == ("my_v1_notes", 12)
+    assert parse_version("notes.txt") is None
+
+    assert get_version_number("tender_BSCGlobal_v03.docx") == 3
+    assert get_version_number("template.docx") == 0
+    assert get_family_name("tender_BSCGlobal_v03.docx") == "tender_BSCGlobal"
+    assert get_family_name("template.docx") == "template.docx"